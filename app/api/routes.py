@@ -1,22 +1,68 @@
 """Rotas da API."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from celery.result import AsyncResult
 from app.api.schemas import (
+    CampaignStateResponse,
+    DeliveryConcurrencyResponse,
     SendEmailsRequest,
     SendEmailsResponse,
     TaskStatusResponse,
 )
-from app.core.celery_app import celery_app
-from app.domain.entities import EmailCampaign
+from app.core.celery_app import SEND_EMAIL_TASK_NAME, celery_app
+from app.core.config import settings
+from app.domain.entities import CampaignState, EmailCampaign
 from app.domain.services import EmailService
-from app.infrastructure.tasks.email_tasks import send_email_task
+from app.infrastructure.campaigns.campaign_control import (
+    CampaignStateError,
+    get_campaign_state,
+    requeue_parked_messages,
+    set_campaign_state,
+)
+from app.infrastructure.cache.redis_client import create_async_redis_client
+from app.infrastructure.delivery.concurrency import get_delivery_limiter
+from app.infrastructure.journal.delivery_journal import get_delivery_journal
+from app.infrastructure.progress.progress_publisher import (
+    initialize_campaign_progress,
+    progress_key,
+)
+from app.infrastructure.progress.progress_stream import ProgressAggregator, stream_progress
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/api/v1", tags=["emails"])
 
 
+def _enqueue_emails(campaign: EmailCampaign, recipients: List[str]) -> List[str]:
+    """Cria uma tarefa Celery por destinatário e retorna os IDs das tarefas."""
+    task_ids = []
+    for email in recipients:
+        # Publica pelo nome para não carregar o módulo do worker (e o SMTP) na API
+        task = celery_app.send_task(
+            SEND_EMAIL_TASK_NAME,
+            kwargs={
+                "to": email,
+                "subject": campaign.subject,
+                "body": campaign.body,
+                "from_email": campaign.from_email,
+                "campaign_id": campaign.campaign_id,
+            },
+        )
+        task_ids.append(task.id)
+        logger.info(f"Tarefa criada para envio de e-mail para {email} (task_id: {task.id})")
+    return task_ids
+
+
+def _initialize_progress(campaign_id: str, total: int) -> None:
+    """Registra o total da campanha para o acompanhamento de progresso (melhor esforço)."""
+    try:
+        initialize_campaign_progress(campaign_id, total)
+    except Exception as e:
+        logger.warning(f"Falha ao registrar progresso da campanha {campaign_id}: {e}")
+
+
 @router.post(
     "/send-emails",
     response_model=SendEmailsResponse,
@@ -49,20 +95,18 @@ async def send_emails(request: SendEmailsRequest) -> SendEmailsResponse:
             from_email=request.from_email,
         )
 
-        # Cria tarefas Celery para cada e-mail
-        task_ids = []
-        for email in valid_emails:
-            task = send_email_task.delay(
-                to=email,
-                subject=campaign.subject,
-                body=campaign.body,
-                from_email=campaign.from_email,
-            )
-            task_ids.append(task.id)
-            logger.info(f"Tarefa criada para envio de e-mail para {email} (task_id: {task.id})")
+        # Registra a campanha no journal antes de enfileirar, para permitir retomada
+        journal = get_delivery_journal()
+        if journal is not None:
+            await run_in_threadpool(journal.record_campaign, campaign)
+
+        await run_in_threadpool(_initialize_progress, campaign.campaign_id, len(valid_emails))
+
+        task_ids = _enqueue_emails(campaign, valid_emails)
 
         return SendEmailsResponse(
             message="Tarefas de envio criadas com sucesso",
+            campaign_id=campaign.campaign_id,
             task_ids=task_ids,
             total_emails=len(valid_emails),
         )
@@ -119,6 +163,234 @@ async def get_task_status(task_id: str) -> TaskStatusResponse:
         )
 
 
+async def _change_campaign_state(
+    campaign_id: str, state: CampaignState
+) -> CampaignStateResponse:
+    """
+    Altera o estado de uma campanha e converte erros em respostas HTTP.
+
+    Ao sair do estado pausado, as mensagens estacionadas pelos workers são
+    republicadas (e enviadas ou descartadas conforme o novo estado).
+    """
+    try:
+        await run_in_threadpool(set_campaign_state, campaign_id, state)
+        requeued = 0
+        if state != CampaignState.PAUSED:
+            requeued = await run_in_threadpool(requeue_parked_messages, campaign_id)
+        return CampaignStateResponse(campaign_id=campaign_id, state=state.value, requeued=requeued)
+
+    except CampaignStateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro ao alterar estado da campanha {campaign_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao alterar estado da campanha: {str(e)}",
+        )
+
+
+@router.post(
+    "/campaigns/{campaign_id}/pause",
+    response_model=CampaignStateResponse,
+    summary="Pausar campanha",
+    description="Suspende os envios pendentes da campanha até que ela seja retomada",
+)
+async def pause_campaign(campaign_id: str) -> CampaignStateResponse:
+    """Endpoint para pausar uma campanha."""
+    return await _change_campaign_state(campaign_id, CampaignState.PAUSED)
+
+
+@router.post(
+    "/campaigns/{campaign_id}/resume",
+    response_model=CampaignStateResponse,
+    summary="Retomar campanha",
+    description="Retoma os envios de uma campanha pausada",
+)
+async def resume_campaign(campaign_id: str) -> CampaignStateResponse:
+    """Endpoint para retomar uma campanha pausada."""
+    return await _change_campaign_state(campaign_id, CampaignState.ACTIVE)
+
+
+@router.post(
+    "/campaigns/{campaign_id}/cancel",
+    response_model=CampaignStateResponse,
+    summary="Cancelar campanha",
+    description="Descarta os envios pendentes da campanha (operação irreversível)",
+)
+async def cancel_campaign(campaign_id: str) -> CampaignStateResponse:
+    """Endpoint para cancelar uma campanha."""
+    return await _change_campaign_state(campaign_id, CampaignState.CANCELLED)
+
+
+@router.get(
+    "/campaigns/{campaign_id}/state",
+    response_model=CampaignStateResponse,
+    summary="Consultar estado de campanha",
+    description="Retorna se a campanha está ativa, pausada ou cancelada",
+)
+async def get_campaign_state_endpoint(campaign_id: str) -> CampaignStateResponse:
+    """Endpoint para consultar o estado de uma campanha."""
+    try:
+        state = await run_in_threadpool(get_campaign_state, campaign_id)
+        return CampaignStateResponse(campaign_id=campaign_id, state=state.value)
+
+    except Exception as e:
+        logger.error(f"Erro ao consultar estado da campanha {campaign_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao consultar estado da campanha: {str(e)}",
+        )
+
+
+@router.post(
+    "/campaigns/{campaign_id}/resume-unsent",
+    response_model=SendEmailsResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Reenfileirar envios pendentes",
+    description="Reconstrói a campanha a partir do journal e enfileira apenas quem não recebeu",
+)
+async def resume_unsent(campaign_id: str) -> SendEmailsResponse:
+    """
+    Endpoint para retomar uma campanha após a perda de workers ou do Redis.
+
+    Destinatários com envio bem-sucedido registrado no journal não são
+    reenfileirados. Deve ser usado quando as tarefas originais não estão
+    mais na fila; caso contrário os envios pendentes seriam duplicados.
+    """
+    journal = get_delivery_journal()
+    if journal is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Journal de entregas desabilitado (DELIVERY_JOURNAL_ENABLED=false)",
+        )
+
+    try:
+        campaign = await run_in_threadpool(journal.get_campaign, campaign_id)
+        if campaign is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Campanha {campaign_id} não encontrada no journal",
+            )
+        state = await run_in_threadpool(get_campaign_state, campaign_id)
+        if state == CampaignState.CANCELLED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Campanha {campaign_id} foi cancelada",
+            )
+
+        unsent = await run_in_threadpool(journal.unsent_recipients, campaign_id)
+        # O progresso passa a acompanhar apenas os envios reenfileirados
+        await run_in_threadpool(_initialize_progress, campaign_id, len(unsent))
+        task_ids = _enqueue_emails(campaign, unsent)
+        logger.info(
+            f"Campanha {campaign_id} retomada: {len(unsent)} de "
+            f"{len(campaign.emails)} destinatários reenfileirados"
+        )
+
+        return SendEmailsResponse(
+            message="Envios pendentes reenfileirados com sucesso",
+            campaign_id=campaign_id,
+            task_ids=task_ids,
+            total_emails=len(unsent),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao retomar campanha {campaign_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao retomar campanha: {str(e)}",
+        )
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _seed_finished_tasks(aggregator: ProgressAggregator) -> None:
+    """Registra no agregador as tarefas que já terminaram, consultando o backend de resultados."""
+    for task_id in aggregator.task_ids or ():
+        task_result = AsyncResult(task_id, app=celery_app)
+        if task_result.ready():
+            result = task_result.result if task_result.successful() else None
+            final_status = result.get("status", "sent") if isinstance(result, dict) else "failed"
+            aggregator.seed_task_status(task_id, final_status)
+
+
+@router.get(
+    "/campaigns/{campaign_id}/progress/stream",
+    summary="Acompanhar progresso de campanha",
+    description=(
+        "Stream SSE com o progresso agregado da campanha (ou de algumas de suas "
+        "tarefas) até a sua conclusão"
+    ),
+)
+async def stream_campaign_progress(
+    campaign_id: str,
+    task_ids: Optional[List[str]] = Query(
+        None, description="IDs das tarefas Celery da campanha a acompanhar (opcional)"
+    ),
+) -> StreamingResponse:
+    """
+    Endpoint de streaming (Server-Sent Events) do progresso de uma campanha.
+
+    Envia periodicamente um resumo com contadores e falhas recentes,
+    substituindo o polling de `/task-status/{task_id}` para cada tarefa.
+    Com `task_ids`, acompanha apenas essas tarefas: as já concluídas são
+    consultadas uma única vez no backend de resultados, fora do event loop.
+    """
+    if task_ids and len(task_ids) > settings.PROGRESS_STREAM_MAX_TASK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {settings.PROGRESS_STREAM_MAX_TASK_IDS} tarefas por stream",
+        )
+
+    redis_client = create_async_redis_client()
+    if not task_ids and not await redis_client.hexists(progress_key(campaign_id), "total"):
+        await redis_client.close()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Progresso da campanha {campaign_id} não encontrado",
+        )
+
+    aggregator = ProgressAggregator(campaign_id=campaign_id, task_ids=task_ids)
+    return StreamingResponse(
+        stream_progress(
+            redis_client, aggregator, seed=_seed_finished_tasks if task_ids else None
+        ),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get(
+    "/delivery/concurrency",
+    response_model=DeliveryConcurrencyResponse,
+    summary="Consultar concorrência de envio",
+    description="Retorna o limite adaptativo de envios simultâneos e as decisões recentes",
+)
+async def get_delivery_concurrency() -> DeliveryConcurrencyResponse:
+    """
+    Endpoint para acompanhar o controle adaptativo de concorrência.
+
+    Permite entender por que a vazão de envio aumentou ou diminuiu.
+    """
+    limiter = get_delivery_limiter()
+    if limiter is None:
+        return DeliveryConcurrencyResponse(enabled=False)
+
+    try:
+        snapshot = await run_in_threadpool(limiter.snapshot)
+        return DeliveryConcurrencyResponse(enabled=True, **snapshot)
+
+    except Exception as e:
+        logger.error(f"Erro ao consultar controle de concorrência: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao consultar controle de concorrência: {str(e)}",
+        )
+
+
 @router.get(
     "/health",
     summary="Health check",
@@ -28,6 +28,7 @@ class SendEmailsResponse(BaseModel):
     """Schema de resposta para envio de e-mails."""
 
     message: str
+    campaign_id: str = Field(..., description="ID da campanha criada")
     task_ids: List[str] = Field(..., description="IDs das tarefas Celery criadas")
     total_emails: int = Field(..., description="Total de e-mails processados")
 
@@ -39,3 +40,37 @@ class TaskStatusResponse(BaseModel):
     status: str = Field(..., description="Status da tarefa: PENDING, SUCCESS, FAILURE, RETRY")
     result: Optional[dict] = Field(None, description="Resultado da tarefa (se concluída)")
     error: Optional[str] = Field(None, description="Mensagem de erro (se falhou)")
+
+
+class CampaignStateResponse(BaseModel):
+    """Schema de resposta para o estado de uma campanha."""
+
+    campaign_id: str
+    state: str = Field(..., description="Estado da campanha: active, paused, cancelled")
+    requeued: int = Field(
+        0, description="Mensagens estacionadas republicadas na mudança de estado"
+    )
+
+
+class ConcurrencyDecision(BaseModel):
+    """Decisão tomada pelo controle adaptativo de concorrência."""
+
+    action: str = Field(..., description="increase ou decrease")
+    reason: str = Field(..., description="healthy, latency, deferral ou error_rate")
+    previous_limit: int
+    limit: int
+    at: float = Field(..., description="Instante da decisão (epoch)")
+
+
+class DeliveryConcurrencyResponse(BaseModel):
+    """Schema de resposta para o estado do controle adaptativo de concorrência."""
+
+    enabled: bool
+    limit: Optional[int] = Field(None, description="Limite atual de envios simultâneos")
+    in_flight: Optional[int] = Field(None, description="Envios em andamento")
+    error_rate: Optional[float] = Field(None, description="Taxa de erro recente (média móvel)")
+    min_limit: Optional[int] = None
+    max_limit: Optional[int] = None
+    decisions: List[ConcurrencyDecision] = Field(
+        default_factory=list, description="Decisões mais recentes (da mais nova para a mais antiga)"
+    )
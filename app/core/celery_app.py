@@ -3,6 +3,9 @@
 from celery import Celery
 from app.core.config import settings
 
+# Nome da tarefa de envio: a API publica pelo nome, sem importar o módulo do worker
+SEND_EMAIL_TASK_NAME = "send_email_task"
+
 # Cria instância do Celery
 celery_app = Celery(
     "bulk_email_sender",
@@ -1,7 +1,7 @@
 """Configurações da aplicação usando Pydantic Settings."""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from functools import lru_cache
 
 
@@ -30,6 +30,44 @@ class Settings(BaseSettings):
     SMTP_USE_TLS: bool = True
     SMTP_FROM_EMAIL: Optional[str] = None
 
+    # Transporte de e-mail: smtp, null, memory, mbox ou maildir
+    EMAIL_TRANSPORT: Literal["smtp", "null", "memory", "mbox", "maildir"] = "smtp"
+    EMAIL_SPOOL_PATH: str = "spool/outbox.mbox"
+    EMAIL_SPOOL_BATCH_SIZE: int = 100
+    EMAIL_SPOOL_FLUSH_INTERVAL: float = 1.0
+
+    # Concorrência adaptativa de envios (AIMD)
+    DELIVERY_ADAPTIVE_CONCURRENCY: bool = True
+    DELIVERY_INITIAL_CONCURRENCY: int = 4
+    DELIVERY_MIN_CONCURRENCY: int = 1
+    DELIVERY_MAX_CONCURRENCY: int = 32
+    DELIVERY_INCREASE_STEP: float = 1.0  # aumento do limite por janela de envios saudáveis
+    DELIVERY_DECREASE_FACTOR: float = 0.5  # fator aplicado ao limite em deferrals/timeouts
+    DELIVERY_LATENCY_TARGET: float = 2.0  # segundos; acima disso o limite é reduzido
+    DELIVERY_ERROR_RATE_THRESHOLD: float = 0.2
+    DELIVERY_DECREASE_COOLDOWN: float = 5.0  # intervalo mínimo entre reduções
+    DELIVERY_SLOT_LEASE: float = 120.0  # slots de workers que morreram expiram após isso
+    DELIVERY_RECORD_BATCH_SIZE: int = 20  # resultados acumulados antes de ajustar o limite
+    DELIVERY_RECORD_FLUSH_INTERVAL: float = 0.5  # segundos máximos entre ajustes
+
+    # Controle de campanhas
+    CAMPAIGN_STATE_TTL: int = 7 * 24 * 60 * 60  # segundos que o estado fica no Redis
+    CAMPAIGN_STATE_CACHE_TTL: float = 2.0  # cache local do estado nos workers
+
+    # Progresso de campanhas
+    PROGRESS_BATCH_SIZE: int = 50  # eventos acumulados pelo worker antes de publicar
+    PROGRESS_FLUSH_INTERVAL: float = 0.5  # segundos máximos entre publicações
+    PROGRESS_STREAM_INTERVAL: float = 1.0  # intervalo entre resumos enviados via SSE
+    PROGRESS_STREAM_HEARTBEAT: float = 15.0
+    PROGRESS_STREAM_MAX_TASK_IDS: int = 1000
+    PROGRESS_STREAM_MAX_DURATION: float = 60 * 60  # segundos máximos de uma conexão SSE
+
+    # Journal de entregas
+    DELIVERY_JOURNAL_ENABLED: bool = True
+    DELIVERY_JOURNAL_PATH: str = "data/delivery_journal.sqlite3"
+    DELIVERY_JOURNAL_BATCH_SIZE: int = 100  # registros por commit em grupo
+    DELIVERY_JOURNAL_FLUSH_INTERVAL: float = 0.2  # janela máxima de perda em um crash
+
     # Flower
     FLOWER_PORT: int = 5555
 
@@ -39,6 +77,11 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @property
+    def REDIS_URL(self) -> str:
+        """URL de conexão com o Redis usado pela aplicação."""
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     def __init__(self, **kwargs):
         """Inicializa as configurações e define URLs do Celery se não fornecidas."""
         super().__init__(**kwargs)
@@ -1,10 +1,20 @@
 """Entidades de domínio."""
 
-from dataclasses import dataclass
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
 from typing import List, Optional
 from datetime import datetime
 
 
+class CampaignState(str, Enum):
+    """Estados de controle de uma campanha de e-mail."""
+
+    ACTIVE = "active"
+    PAUSED = "paused"
+    CANCELLED = "cancelled"
+
+
 @dataclass
 class EmailMessage:
     """Entidade que representa uma mensagem de e-mail."""
@@ -35,6 +45,7 @@ class EmailCampaign:
     body: str
     from_email: Optional[str] = None
     created_at: Optional[datetime] = None
+    campaign_id: str = field(default_factory=lambda: str(uuid.uuid4()))
 
     def __post_init__(self):
         """Valida a campanha após inicialização."""
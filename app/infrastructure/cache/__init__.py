@@ -0,0 +1 @@
+"""Módulo de cache da infraestrutura."""
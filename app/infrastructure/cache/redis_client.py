@@ -0,0 +1,27 @@
+"""Cliente Redis compartilhado pela aplicação."""
+
+from functools import lru_cache
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+
+
+@lru_cache()
+def get_redis_client() -> Redis:
+    """Retorna instância singleton do cliente Redis.
+
+    A conexão só é aberta no primeiro comando executado, então importar este
+    módulo não exige um Redis disponível.
+    """
+    return Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+def create_async_redis_client() -> AsyncRedis:
+    """Cria um cliente Redis assíncrono.
+
+    Não é compartilhado porque cada conexão de streaming mantém a sua própria
+    assinatura pub/sub e deve fechar o cliente ao terminar.
+    """
+    return AsyncRedis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -0,0 +1 @@
+"""Módulo de controle de campanhas da infraestrutura."""
@@ -0,0 +1,220 @@
+"""Controle de pausa, retomada e cancelamento de campanhas via Redis.
+
+Cada campanha possui uma única chave no Redis com o seu estado. Alterar o
+estado é uma operação O(1), independente do número de tarefas enfileiradas,
+e os workers consultam a chave através de um cache local de TTL curto.
+
+Mensagens de campanhas pausadas são estacionadas em uma lista no Redis (e
+não mantidas na memória dos workers); ao retomar ou cancelar a campanha,
+elas são republicadas com o task_id original.
+"""
+
+import json
+import time
+from typing import Dict, Tuple
+
+from app.core.celery_app import SEND_EMAIL_TASK_NAME, celery_app
+from app.core.config import settings
+from app.domain.entities import CampaignState
+from app.infrastructure.cache.redis_client import get_redis_client
+from app.utils.logger import logger
+
+# Cache local (por processo) de estados: campaign_id -> (estado, expira_em)
+_state_cache: Dict[str, Tuple[CampaignState, float]] = {}
+
+# Mensagens lidas por lote ao liberar uma campanha
+_REQUEUE_BATCH_SIZE = 500
+# Segundos máximos de posse e de espera do lock de republicação
+_REQUEUE_LOCK_TIMEOUT = 300
+_REQUEUE_LOCK_WAIT = 30
+
+# Altera o estado atomicamente, recusando sair de "cancelled"
+_SET_STATE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == 'cancelled' and ARGV[1] ~= 'cancelled' then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+# Estaciona a mensagem somente se a campanha ainda estiver pausada
+_PARK_SCRIPT = """
+local state = redis.call('GET', KEYS[1])
+if state == 'paused' then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+    return state
+end
+return state or 'active'
+"""
+
+
+class CampaignStateError(Exception):
+    """Transição de estado de campanha não permitida."""
+
+
+def _state_key(campaign_id: str) -> str:
+    """Retorna a chave Redis que guarda o estado da campanha."""
+    return f"campaign:{campaign_id}:state"
+
+
+def _parked_key(campaign_id: str) -> str:
+    """Retorna a chave Redis da lista de mensagens estacionadas da campanha."""
+    return f"campaign:{campaign_id}:parked"
+
+
+def _parse_state(campaign_id: str, value) -> CampaignState:
+    """Converte o valor gravado no Redis em `CampaignState`."""
+    if not value:
+        return CampaignState.ACTIVE
+    try:
+        return CampaignState(value)
+    except ValueError:
+        logger.warning(f"Estado desconhecido para campanha {campaign_id}: {value}")
+        return CampaignState.ACTIVE
+
+
+def get_campaign_state(campaign_id: str) -> CampaignState:
+    """
+    Consulta o estado atual de uma campanha diretamente no Redis.
+
+    Args:
+        campaign_id: Identificador da campanha
+
+    Returns:
+        Estado da campanha (ACTIVE quando não há registro)
+    """
+    return _parse_state(campaign_id, get_redis_client().get(_state_key(campaign_id)))
+
+
+def get_cached_campaign_state(campaign_id: str) -> CampaignState:
+    """
+    Consulta o estado da campanha usando o cache local do processo.
+
+    Usado pelos workers: no máximo uma consulta ao Redis por campanha a cada
+    `CAMPAIGN_STATE_CACHE_TTL` segundos. Se o Redis estiver indisponível, a
+    campanha é tratada como ativa para não interromper os envios.
+
+    Args:
+        campaign_id: Identificador da campanha
+
+    Returns:
+        Estado da campanha
+    """
+    now = time.monotonic()
+    cached = _state_cache.get(campaign_id)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    try:
+        state = get_campaign_state(campaign_id)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning(f"Falha ao consultar estado da campanha {campaign_id}: {exc}")
+        return cached[0] if cached else CampaignState.ACTIVE
+
+    # Remove entradas expiradas para o cache não crescer indefinidamente
+    for key in [key for key, (_, expires_at) in _state_cache.items() if expires_at <= now]:
+        del _state_cache[key]
+
+    _state_cache[campaign_id] = (state, now + settings.CAMPAIGN_STATE_CACHE_TTL)
+    return state
+
+
+def set_campaign_state(campaign_id: str, state: CampaignState) -> CampaignState:
+    """
+    Altera o estado de uma campanha.
+
+    A verificação e a escrita são feitas atomicamente no Redis, então
+    campanhas canceladas nunca voltam a ser pausadas ou retomadas, mesmo
+    com requisições concorrentes.
+
+    Args:
+        campaign_id: Identificador da campanha
+        state: Novo estado
+
+    Returns:
+        Estado gravado
+
+    Raises:
+        CampaignStateError: Se a campanha já estiver cancelada
+    """
+    client = get_redis_client()
+    result = client.register_script(_SET_STATE_SCRIPT)(
+        keys=[_state_key(campaign_id)],
+        args=[state.value, settings.CAMPAIGN_STATE_TTL],
+    )
+    if result != state.value:
+        raise CampaignStateError(f"Campanha {campaign_id} já foi cancelada")
+
+    _state_cache.pop(campaign_id, None)
+    logger.info(f"Campanha {campaign_id} alterada para o estado {state.value}")
+    return state
+
+
+def park_message(campaign_id: str, task_id: str, kwargs: dict) -> CampaignState:
+    """
+    Estaciona uma mensagem de campanha pausada até a retomada ou o cancelamento.
+
+    Args:
+        campaign_id: Identificador da campanha
+        task_id: ID da tarefa, reutilizado ao republicar
+        kwargs: Argumentos da tarefa
+
+    Returns:
+        Estado atual da campanha; a mensagem só foi estacionada se for PAUSED
+    """
+    payload = json.dumps({"task_id": task_id, "kwargs": kwargs})
+    result = get_redis_client().register_script(_PARK_SCRIPT)(
+        keys=[_state_key(campaign_id), _parked_key(campaign_id)],
+        args=[payload, settings.CAMPAIGN_STATE_TTL],
+    )
+    return _parse_state(campaign_id, result)
+
+
+def requeue_parked_messages(campaign_id: str) -> int:
+    """
+    Republica as mensagens estacionadas de uma campanha com o task_id original.
+
+    Deve ser chamada depois de a campanha sair do estado PAUSED: a partir daí
+    nenhuma nova mensagem é estacionada. Em campanhas canceladas, os workers
+    registram as mensagens republicadas como canceladas.
+
+    Cada lote é lido sem remoção e só as mensagens já publicadas são retiradas
+    da lista, então uma falha do broker no meio do lote não perde mensagens:
+    elas continuam estacionadas para a próxima chamada. Um lock por campanha
+    evita que chamadas concorrentes publiquem a mesma mensagem duas vezes.
+
+    Args:
+        campaign_id: Identificador da campanha
+
+    Returns:
+        Quantidade de mensagens republicadas
+    """
+    client = get_redis_client()
+    key = _parked_key(campaign_id)
+    requeued = 0
+    with client.lock(
+        f"{key}:lock", timeout=_REQUEUE_LOCK_TIMEOUT, blocking_timeout=_REQUEUE_LOCK_WAIT
+    ):
+        while True:
+            items = client.lrange(key, 0, _REQUEUE_BATCH_SIZE - 1)
+            if not items:
+                break
+            published = 0
+            try:
+                for item in items:
+                    message = json.loads(item)
+                    celery_app.send_task(
+                        SEND_EMAIL_TASK_NAME, kwargs=message["kwargs"], task_id=message["task_id"]
+                    )
+                    published += 1
+            finally:
+                # Remove da lista apenas as mensagens efetivamente publicadas
+                if published:
+                    client.ltrim(key, published, -1)
+                requeued += published
+
+    if requeued:
+        logger.info(f"Campanha {campaign_id}: {requeued} mensagens estacionadas republicadas")
+    return requeued
@@ -0,0 +1 @@
+"""Módulo de controle de entrega da infraestrutura."""
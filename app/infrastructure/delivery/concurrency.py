@@ -0,0 +1,284 @@
+"""Controle adaptativo de concorrência de envios (AIMD).
+
+O limite de envios simultâneos é compartilhado por todos os workers via
+Redis. Cada envio bem-sucedido com latência saudável aumenta o limite de
+forma aditiva (cerca de `increase` por janela de `limit` envios), desde que
+o limite atual esteja de fato em uso; deferrals
+4xx, timeouts, latência acima do alvo ou taxa de erro alta reduzem o limite
+de forma multiplicativa, no máximo uma vez por `cooldown` segundos.
+
+Os resultados dos envios são acumulados em memória por processo e aplicados
+ao estado compartilhado em lote, em uma única transação por flush, para não
+disputar a chave de estado a cada envio.
+"""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from redis import Redis
+
+from app.core.config import settings
+from app.infrastructure.cache.redis_client import get_redis_client
+from app.utils.batching import BatchWriter
+from app.utils.logger import logger
+
+# Peso da amostra mais recente na média móvel da taxa de erro
+_ERROR_RATE_ALPHA = 0.1
+# Quantidade de decisões mantidas para consulta pelos operadores
+_MAX_DECISIONS = 50
+
+
+@dataclass
+class AIMDController:
+    """Regras AIMD puras, sem dependência de Redis."""
+
+    limit: float
+    min_limit: float = 1.0
+    max_limit: float = 32.0
+    increase: float = 1.0
+    decrease_factor: float = 0.5
+    latency_target: float = 2.0
+    error_rate_threshold: float = 0.2
+    cooldown: float = 5.0
+    error_rate: float = 0.0
+    last_decrease: float = 0.0
+
+    def _update_error_rate(self, failed: bool) -> None:
+        """Atualiza a média móvel exponencial da taxa de erro."""
+        sample = 1.0 if failed else 0.0
+        self.error_rate += _ERROR_RATE_ALPHA * (sample - self.error_rate)
+
+    def _decision(self, action: str, reason: str, previous: float, now: float) -> Optional[dict]:
+        """Retorna a decisão apenas quando o limite efetivo (inteiro) muda."""
+        if int(previous) == int(self.limit):
+            return None
+        return {
+            "action": action,
+            "reason": reason,
+            "previous_limit": int(previous),
+            "limit": int(self.limit),
+            "at": now,
+        }
+
+    def _decrease(self, reason: str, now: float) -> Optional[dict]:
+        """Reduz o limite de forma multiplicativa respeitando o cooldown."""
+        if now - self.last_decrease < self.cooldown:
+            return None
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.last_decrease = now
+        return self._decision("decrease", reason, previous, now)
+
+    def on_success(
+        self, latency: float, now: float, in_flight: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Registra um envio bem-sucedido.
+
+        O limite só cresce quando os envios em andamento estão a no máximo um
+        slot do limite atual. Assim ele não sobe além do que os workers
+        conseguem usar e uma redução tem efeito imediato.
+
+        Args:
+            latency: Duração do envio em segundos
+            now: Instante atual (epoch)
+            in_flight: Envios em andamento (None quando desconhecido)
+
+        Returns:
+            Decisão tomada, se o limite efetivo mudou
+        """
+        self._update_error_rate(failed=False)
+        if latency > self.latency_target:
+            return self._decrease("latency", now)
+        if in_flight is not None and in_flight < int(self.limit) - 1:
+            return None
+
+        previous = self.limit
+        self.limit = min(self.max_limit, self.limit + self.increase / max(self.limit, 1.0))
+        return self._decision("increase", "healthy", previous, now)
+
+    def on_failure(self, transient: bool, now: float) -> Optional[dict]:
+        """
+        Registra um envio com falha.
+
+        Args:
+            transient: True para deferrals 4xx e timeouts
+            now: Instante atual (epoch)
+
+        Returns:
+            Decisão tomada, se o limite efetivo mudou
+        """
+        self._update_error_rate(failed=True)
+        if transient:
+            return self._decrease("deferral", now)
+        if self.error_rate > self.error_rate_threshold:
+            return self._decrease("error_rate", now)
+        return None
+
+
+class DeliveryLimiter(BatchWriter):
+    """Limitador de envios simultâneos compartilhado entre workers via Redis.
+
+    Os envios em andamento são mantidos em um sorted set com o horário de
+    início; entradas mais antigas que `slot_lease` segundos são descartadas,
+    então um worker que morre no meio de um envio não prende o slot.
+
+    Os resultados registrados por `record` ficam no buffer do processo e são
+    aplicados ao controlador AIMD em lote (ver `BatchWriter`).
+    """
+
+    STATE_KEY = "delivery:concurrency"
+    INFLIGHT_KEY = "delivery:inflight"
+    DECISIONS_KEY = "delivery:decisions"
+
+    def __init__(
+        self,
+        client: Redis,
+        slot_lease: float,
+        batch_size: int = 20,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.client = client
+        self.slot_lease = slot_lease
+
+    @staticmethod
+    def _new_controller() -> AIMDController:
+        """Cria o controlador com os parâmetros de `settings`."""
+        return AIMDController(
+            limit=float(settings.DELIVERY_INITIAL_CONCURRENCY),
+            min_limit=float(settings.DELIVERY_MIN_CONCURRENCY),
+            max_limit=float(settings.DELIVERY_MAX_CONCURRENCY),
+            increase=settings.DELIVERY_INCREASE_STEP,
+            decrease_factor=settings.DELIVERY_DECREASE_FACTOR,
+            latency_target=settings.DELIVERY_LATENCY_TARGET,
+            error_rate_threshold=settings.DELIVERY_ERROR_RATE_THRESHOLD,
+            cooldown=settings.DELIVERY_DECREASE_COOLDOWN,
+        )
+
+    def _load_controller(self, client: Redis) -> AIMDController:
+        """Carrega o estado do controlador gravado no Redis."""
+        controller = self._new_controller()
+        state = client.hgetall(self.STATE_KEY)
+        if state:
+            controller.limit = float(state.get("limit", controller.limit))
+            controller.error_rate = float(state.get("error_rate", 0.0))
+            controller.last_decrease = float(state.get("last_decrease", 0.0))
+        return controller
+
+    @staticmethod
+    def _effective_limit(limit: Optional[str]) -> int:
+        """Converte o limite gravado no Redis no número de slots disponíveis."""
+        if limit is None:
+            return int(settings.DELIVERY_INITIAL_CONCURRENCY)
+        return int(float(limit))
+
+    def acquire(self) -> Optional[str]:
+        """
+        Tenta reservar um slot de envio.
+
+        Returns:
+            Token do slot reservado, ou None se o limite foi atingido
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(self.INFLIGHT_KEY, "-inf", now - self.slot_lease)
+        pipe.zadd(self.INFLIGHT_KEY, {token: now})
+        pipe.zrank(self.INFLIGHT_KEY, token)
+        pipe.hget(self.STATE_KEY, "limit")
+        _, _, rank, limit = pipe.execute()
+
+        if rank is not None and rank < self._effective_limit(limit):
+            return token
+
+        self.client.zrem(self.INFLIGHT_KEY, token)
+        return None
+
+    def release(self, token: str) -> None:
+        """Libera um slot reservado por `acquire`."""
+        self.client.zrem(self.INFLIGHT_KEY, token)
+
+    def record(self, success: bool, latency: float, transient: bool = False) -> None:
+        """
+        Registra o resultado de um envio (aplicado ao limite no próximo lote).
+
+        Args:
+            success: Se o envio foi concluído
+            latency: Duração do envio em segundos
+            transient: Se a falha foi um deferral 4xx ou timeout
+        """
+        self.add((success, latency, transient, time.time()))
+
+    def _write(self, batch: List[Tuple[bool, float, bool, float]]) -> None:
+        """Aplica um lote de resultados ao controlador em uma única transação."""
+        decisions: List[dict] = []
+
+        def _apply(pipe) -> None:
+            decisions.clear()
+            controller = self._load_controller(pipe)
+            in_flight = pipe.zcount(self.INFLIGHT_KEY, time.time() - self.slot_lease, "+inf")
+            for success, latency, transient, now in batch:
+                if success:
+                    decision = controller.on_success(latency, now, in_flight)
+                else:
+                    decision = controller.on_failure(transient, now)
+                if decision:
+                    decisions.append(decision)
+
+            pipe.multi()
+            pipe.hset(
+                self.STATE_KEY,
+                mapping={
+                    "limit": controller.limit,
+                    "error_rate": controller.error_rate,
+                    "last_decrease": controller.last_decrease,
+                },
+            )
+            if decisions:
+                pipe.lpush(self.DECISIONS_KEY, *[json.dumps(item) for item in decisions])
+                pipe.ltrim(self.DECISIONS_KEY, 0, _MAX_DECISIONS - 1)
+
+        self.client.transaction(_apply, self.STATE_KEY)
+
+        for decision in decisions:
+            logger.info(
+                f"Concorrência de envio {decision['action']} "
+                f"{decision['previous_limit']} -> {decision['limit']} ({decision['reason']})"
+            )
+
+    def snapshot(self) -> dict:
+        """Retorna o estado atual do limitador para exposição aos operadores."""
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.hgetall(self.STATE_KEY)
+        pipe.zcount(self.INFLIGHT_KEY, now - self.slot_lease, "+inf")
+        pipe.lrange(self.DECISIONS_KEY, 0, _MAX_DECISIONS - 1)
+        state, in_flight, decisions = pipe.execute()
+
+        controller = self._new_controller()
+        return {
+            "limit": int(float(state.get("limit", controller.limit))),
+            "in_flight": in_flight,
+            "error_rate": float(state.get("error_rate", 0.0)),
+            "min_limit": int(controller.min_limit),
+            "max_limit": int(controller.max_limit),
+            "decisions": [json.loads(item) for item in decisions],
+        }
+
+
+@lru_cache()
+def get_delivery_limiter() -> Optional[DeliveryLimiter]:
+    """Retorna o limitador singleton, ou None se o controle adaptativo estiver desligado."""
+    if not settings.DELIVERY_ADAPTIVE_CONCURRENCY:
+        return None
+    return DeliveryLimiter(
+        get_redis_client(),
+        slot_lease=settings.DELIVERY_SLOT_LEASE,
+        batch_size=settings.DELIVERY_RECORD_BATCH_SIZE,
+        flush_interval=settings.DELIVERY_RECORD_FLUSH_INTERVAL,
+    )
@@ -1,41 +1,29 @@
-"""Integração de envio de e-mails utilizando FastAPI-Mail."""
+"""Cliente de envio de e-mails sobre o transporte configurado."""
 
-import asyncio
-from typing import List
+import time
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
-
-from app.core.config import settings
 from app.domain.entities import EmailMessage
+from app.infrastructure.delivery.concurrency import get_delivery_limiter
+from app.infrastructure.email.transports import TransientTransportError, get_transport
 from app.utils.logger import logger
 
 
-def _build_connection_config() -> ConnectionConfig:
-    """Constrói a configuração para o FastMail baseada nas `settings`."""
-
-    mail_from = settings.SMTP_FROM_EMAIL or settings.SMTP_USER or "no-reply@example.com"
-    username = settings.SMTP_USER or ""
-    password = settings.SMTP_PASS or ""
-    use_credentials = bool(username and password)
-
-    config = ConnectionConfig(
-        MAIL_USERNAME=username,
-        MAIL_PASSWORD=password,
-        MAIL_FROM=mail_from,
-        MAIL_PORT=settings.SMTP_PORT,
-        MAIL_SERVER=settings.SMTP_HOST,
-        MAIL_STARTTLS=settings.SMTP_USE_TLS,
-        MAIL_SSL_TLS=False,
-        USE_CREDENTIALS=use_credentials,
-        VALIDATE_CERTS=True,
-    )
-    return config
-
-_mail_config = _build_connection_config()
+def _record_delivery(success: bool, latency: float, transient: bool = False) -> None:
+    """Informa o resultado do envio ao controle adaptativo de concorrência."""
+    limiter = get_delivery_limiter()
+    if limiter is None:
+        return
+    try:
+        limiter.record(success=success, latency=latency, transient=transient)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning(f"Falha ao registrar resultado no controle de concorrência: {exc}")
 
 
 def send_email(message: EmailMessage) -> bool:
-    """Envia um e-mail usando FastAPI-Mail.
+    """Envia um e-mail usando o transporte configurado em `settings`.
+
+    A latência e o tipo de falha (deferral/timeout ou erro permanente) são
+    repassados ao controle adaptativo de concorrência.
 
     Args:
         message: Entidade de domínio contendo os dados do e-mail.
@@ -44,24 +32,20 @@ def send_email(message: EmailMessage) -> bool:
         True em caso de sucesso, False caso contrário.
     """
 
-    mail_from = message.from_email or settings.SMTP_FROM_EMAIL or settings.SMTP_USER
-    recipients: List[str] = [message.to]
-
-    msg_schema = MessageSchema(
-        subject=message.subject,
-        recipients=recipients,
-        body=message.body,
-        subtype="plain",
-        sender=mail_from,
-    )
-
-    fast_mail = FastMail(_mail_config)
-
+    started = time.monotonic()
     try:
-        asyncio.run(fast_mail.send_message(msg_schema))
-        logger.info(f"E-mail enviado com sucesso para: {message.to}")
-        return True
+        get_transport().send(message)
     except Exception as exc:  # pylint: disable=broad-except
+        # Transportes sinalizam falhas com TransportError; qualquer outra exceção
+        # também é tratada como falha permanente do envio
+        _record_delivery(
+            success=False,
+            latency=time.monotonic() - started,
+            transient=isinstance(exc, TransientTransportError),
+        )
         logger.error(f"Erro ao enviar e-mail para {message.to}: {exc}")
         return False
 
+    _record_delivery(success=True, latency=time.monotonic() - started)
+    logger.info(f"E-mail enviado com sucesso para: {message.to}")
+    return True
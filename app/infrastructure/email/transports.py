@@ -0,0 +1,297 @@
+"""Transportes de envio de e-mail.
+
+O transporte usado pelos workers é escolhido em `Settings.EMAIL_TRANSPORT`:
+
+- `smtp`: envio real via FastAPI-Mail (padrão)
+- `null`: descarta as mensagens, útil para medir o overhead do pipeline
+- `memory`: guarda as mensagens em memória, útil para testes
+- `mbox` / `maildir`: grava as mensagens em disco em lotes (dry runs)
+"""
+
+import asyncio
+import atexit
+import mailbox
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from email.message import EmailMessage as MimeMessage
+from email.utils import formatdate, make_msgid
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
+
+from app.core.config import settings
+from app.domain.entities import EmailMessage
+from app.utils.batching import BatchWriter
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plataformas sem fcntl (Windows)
+    fcntl = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_mail import ConnectionConfig, FastMail
+
+# Linhas que começam com "From " (já escapadas ou não) no formato mboxrd
+_MBOXRD_FROM = re.compile(rb"^(>*From )", re.MULTILINE)
+
+
+class TransportError(Exception):
+    """Falha ao entregar uma mensagem pelo transporte."""
+
+
+class TransientTransportError(TransportError):
+    """Falha temporária (deferral 4xx, timeout ou conexão recusada)."""
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Indica se a exceção (ou alguma de sua cadeia) é uma falha temporária."""
+    while exc is not None:
+        if isinstance(exc, (TimeoutError, ConnectionError)):
+            return True
+        codes = [getattr(exc, "code", None)]
+        codes += [getattr(item, "code", None) for item in getattr(exc, "recipients", None) or []]
+        if any(isinstance(code, int) and 400 <= code < 500 for code in codes):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class EmailTransport(ABC):
+    """Interface comum dos transportes de e-mail."""
+
+    @abstractmethod
+    def send(self, message: EmailMessage) -> None:
+        """
+        Entrega uma mensagem.
+
+        Args:
+            message: Entidade de domínio contendo os dados do e-mail.
+
+        Raises:
+            TransportError: Se a mensagem não puder ser entregue.
+        """
+
+    def flush(self) -> None:
+        """Persiste mensagens pendentes (transportes com buffer)."""
+
+    def close(self) -> None:
+        """Libera os recursos do transporte."""
+        self.flush()
+
+
+def _sender_for(message: EmailMessage) -> str:
+    """Retorna o remetente efetivo de uma mensagem."""
+    return (
+        message.from_email
+        or settings.SMTP_FROM_EMAIL
+        or settings.SMTP_USER
+        or "no-reply@example.com"
+    )
+
+
+class SMTPTransport(EmailTransport):
+    """Transporte SMTP usando FastAPI-Mail.
+
+    O FastAPI-Mail, a configuração de conexão e o cliente só são carregados
+    no primeiro envio, para que processos que nunca enviam não paguem por eles.
+    """
+
+    def __init__(self):
+        self._fast_mail: Optional["FastMail"] = None
+
+    @staticmethod
+    def _build_connection_config() -> "ConnectionConfig":
+        """Constrói a configuração para o FastMail baseada nas `settings`."""
+        from fastapi_mail import ConnectionConfig
+
+        mail_from = settings.SMTP_FROM_EMAIL or settings.SMTP_USER or "no-reply@example.com"
+        username = settings.SMTP_USER or ""
+        password = settings.SMTP_PASS or ""
+        use_credentials = bool(username and password)
+
+        return ConnectionConfig(
+            MAIL_USERNAME=username,
+            MAIL_PASSWORD=password,
+            MAIL_FROM=mail_from,
+            MAIL_PORT=settings.SMTP_PORT,
+            MAIL_SERVER=settings.SMTP_HOST,
+            MAIL_STARTTLS=settings.SMTP_USE_TLS,
+            MAIL_SSL_TLS=False,
+            USE_CREDENTIALS=use_credentials,
+            VALIDATE_CERTS=True,
+        )
+
+    def _get_client(self) -> "FastMail":
+        """Retorna o cliente FastMail, criando-o no primeiro uso."""
+        if self._fast_mail is None:
+            from fastapi_mail import FastMail
+
+            self._fast_mail = FastMail(self._build_connection_config())
+        return self._fast_mail
+
+    def send(self, message: EmailMessage) -> None:
+        """Envia a mensagem pelo servidor SMTP configurado."""
+        from fastapi_mail import MessageSchema
+
+        try:
+            msg_schema = MessageSchema(
+                subject=message.subject,
+                recipients=[message.to],
+                body=message.body,
+                subtype="plain",
+                sender=_sender_for(message),
+            )
+            asyncio.run(self._get_client().send_message(msg_schema))
+        except Exception as exc:  # pylint: disable=broad-except
+            if _is_transient(exc):
+                raise TransientTransportError(str(exc)) from exc
+            raise TransportError(str(exc)) from exc
+
+
+class NullTransport(EmailTransport):
+    """Transporte que descarta todas as mensagens."""
+
+    def send(self, message: EmailMessage) -> None:
+        """Não faz nada."""
+
+
+class InMemoryTransport(EmailTransport):
+    """Transporte que guarda as mensagens enviadas em memória."""
+
+    def __init__(self):
+        self.messages: List[EmailMessage] = []
+        self._lock = threading.Lock()
+
+    def send(self, message: EmailMessage) -> None:
+        """Adiciona a mensagem à lista de mensagens enviadas."""
+        with self._lock:
+            self.messages.append(message)
+
+    def clear(self) -> None:
+        """Remove todas as mensagens coletadas."""
+        with self._lock:
+            self.messages.clear()
+
+
+class SpoolTransport(BatchWriter, EmailTransport):
+    """Transporte que grava as mensagens em um mbox ou maildir.
+
+    As mensagens são acumuladas em memória e gravadas em lote quando o
+    buffer atinge `batch_size` ou, por uma thread de fundo, a cada
+    `flush_interval` segundos. Um lote que falha volta para o buffer e é
+    gravado no próximo flush; um crash do processo perde no máximo um lote.
+
+    No formato mbox os lotes são apenas anexados ao arquivo (mboxrd), sob
+    lock `fcntl`, sem reler as mensagens existentes: o custo de cada lote
+    não cresce com o tamanho do spool.
+    """
+
+    retain_on_error = True
+
+    def __init__(
+        self,
+        path: str,
+        spool_format: str = "mbox",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        if spool_format not in ("mbox", "maildir"):
+            raise ValueError(f"Formato de spool desconhecido: {spool_format}")
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+        self.spool_format = spool_format
+
+    @staticmethod
+    def _to_mime(message: EmailMessage) -> MimeMessage:
+        """Converte a entidade de domínio em uma mensagem MIME."""
+        mime = MimeMessage()
+        mime["From"] = _sender_for(message)
+        mime["To"] = message.to
+        mime["Subject"] = message.subject
+        mime["Date"] = formatdate(localtime=False)
+        mime["Message-ID"] = make_msgid()
+        mime.set_content(message.body)
+        return mime
+
+    def send(self, message: EmailMessage) -> None:
+        """Adiciona a mensagem ao buffer (gravada no próximo lote)."""
+        try:
+            mime = self._to_mime(message)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Ex.: cabeçalho com quebra de linha; erro permanente da mensagem
+            raise TransportError(f"Mensagem inválida: {exc}") from exc
+        self.add(mime)
+
+    @staticmethod
+    def _to_mbox_entry(mime: MimeMessage) -> bytes:
+        """Serializa a mensagem como uma entrada mboxrd (separador, mensagem e linha vazia)."""
+        separator = f"From MAILER-DAEMON {time.asctime(time.gmtime())}\n".encode()
+        data = _MBOXRD_FROM.sub(rb">\1", mime.as_bytes())
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        return separator + data + b"\n"
+
+    def _append_mbox(self, batch: List[MimeMessage]) -> None:
+        """Anexa um lote ao arquivo mbox sob lock exclusivo."""
+        payload = b"".join(self._to_mbox_entry(mime) for mime in batch)
+        with open(self.path, "ab") as spool:
+            if fcntl is not None:
+                fcntl.lockf(spool, fcntl.LOCK_EX)
+            try:
+                spool.write(payload)
+                spool.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(spool, fcntl.LOCK_UN)
+
+    def _write(self, batch: List[MimeMessage]) -> None:
+        """Grava um lote de mensagens no spool."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.spool_format == "mbox":
+            self._append_mbox(batch)
+            return
+
+        box = mailbox.Maildir(self.path, create=True)
+        for mime in batch:
+            box.add(mime)
+
+
+def build_transport(name: Optional[str] = None) -> EmailTransport:
+    """
+    Cria o transporte de e-mail a partir do nome configurado.
+
+    Args:
+        name: Nome do transporte (default: `settings.EMAIL_TRANSPORT`)
+
+    Returns:
+        Instância do transporte
+    """
+    name = (name or settings.EMAIL_TRANSPORT).lower()
+
+    if name == "smtp":
+        return SMTPTransport()
+    if name == "null":
+        return NullTransport()
+    if name == "memory":
+        return InMemoryTransport()
+    if name in ("mbox", "maildir"):
+        return SpoolTransport(
+            path=settings.EMAIL_SPOOL_PATH,
+            spool_format=name,
+            batch_size=settings.EMAIL_SPOOL_BATCH_SIZE,
+            flush_interval=settings.EMAIL_SPOOL_FLUSH_INTERVAL,
+        )
+    raise ValueError(f"Transporte de e-mail desconhecido: {name}")
+
+
+@lru_cache()
+def get_transport() -> EmailTransport:
+    """Retorna instância singleton do transporte configurado."""
+    transport = build_transport()
+    atexit.register(transport.close)
+    return transport
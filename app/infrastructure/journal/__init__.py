@@ -0,0 +1 @@
+"""Módulo de journal de entregas da infraestrutura."""
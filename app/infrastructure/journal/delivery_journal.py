@@ -0,0 +1,221 @@
+"""Journal durável de entregas em SQLite.
+
+A API grava a definição de cada campanha (assunto, corpo e destinatários)
+no momento do enfileiramento e os workers registram o resultado de cada
+envio. Os registros dos workers são acumulados em memória e gravados com
+commit em grupo (uma transação por lote), então o custo por mensagem é
+praticamente nulo. Em caso de crash de um worker, no máximo os registros
+dos últimos `DELIVERY_JOURNAL_FLUSH_INTERVAL` segundos são perdidos.
+
+A partir do journal é possível reconstruir os destinatários de uma campanha
+que ainda não receberam o e-mail e reenfileirar apenas esses.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional
+
+from app.core.config import settings
+from app.domain.entities import EmailCampaign
+from app.utils.batching import BatchWriter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    from_email TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS campaign_recipients (
+    campaign_id TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, recipient)
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    task_id TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_campaign
+    ON deliveries (campaign_id, recipient, status);
+"""
+
+
+class DeliveryJournal(BatchWriter):
+    """Journal de campanhas e resultados de envio."""
+
+    retain_on_error = True
+
+    def __init__(self, path: str, batch_size: int, flush_interval: float):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._db_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Retorna a conexão do processo atual, criando-a se necessário."""
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        # WAL permite leituras concorrentes e commits sem fsync a cada transação
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    def record_campaign(self, campaign: EmailCampaign) -> None:
+        """
+        Grava a definição e os destinatários de uma campanha.
+
+        Args:
+            campaign: Campanha enfileirada
+        """
+        with self._db_lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute(
+                    "INSERT OR IGNORE INTO campaigns "
+                    "(campaign_id, subject, body, from_email, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        campaign.campaign_id,
+                        campaign.subject,
+                        campaign.body,
+                        campaign.from_email,
+                        time.time(),
+                    ),
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO campaign_recipients (campaign_id, recipient) "
+                    "VALUES (?, ?)",
+                    [(campaign.campaign_id, email) for email in campaign.emails],
+                )
+
+    def record(
+        self,
+        campaign_id: str,
+        recipient: str,
+        task_id: Optional[str],
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Registra o resultado de um envio (gravado no próximo commit em grupo).
+
+        Args:
+            campaign_id: Campanha do envio
+            recipient: Destinatário
+            task_id: Tarefa Celery do envio
+            status: sent, failed ou cancelled
+            error: Mensagem de erro (se houver)
+        """
+        self.add((campaign_id, recipient, task_id, status, error, time.time()))
+
+    def _write(self, batch: List[tuple]) -> None:
+        """Grava um lote de resultados em uma única transação."""
+        with self._db_lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT INTO deliveries "
+                    "(campaign_id, recipient, task_id, status, error, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+
+    def get_campaign(self, campaign_id: str) -> Optional[EmailCampaign]:
+        """
+        Reconstrói uma campanha a partir do journal.
+
+        Args:
+            campaign_id: Identificador da campanha
+
+        Returns:
+            Campanha com todos os destinatários, ou None se não registrada
+        """
+        with self._db_lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT subject, body, from_email FROM campaigns WHERE campaign_id = ?",
+                (campaign_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            recipients = [
+                recipient
+                for (recipient,) in connection.execute(
+                    "SELECT recipient FROM campaign_recipients WHERE campaign_id = ? "
+                    "ORDER BY rowid",
+                    (campaign_id,),
+                )
+            ]
+
+        subject, body, from_email = row
+        return EmailCampaign(
+            emails=recipients,
+            subject=subject,
+            body=body,
+            from_email=from_email,
+            campaign_id=campaign_id,
+        )
+
+    def unsent_recipients(self, campaign_id: str) -> List[str]:
+        """
+        Lista os destinatários da campanha sem envio bem-sucedido registrado.
+
+        Args:
+            campaign_id: Identificador da campanha
+
+        Returns:
+            Destinatários pendentes, na ordem original da campanha
+        """
+        with self._db_lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT r.recipient FROM campaign_recipients r "
+                "WHERE r.campaign_id = ? AND NOT EXISTS ("
+                "    SELECT 1 FROM deliveries d WHERE d.campaign_id = r.campaign_id "
+                "    AND d.recipient = r.recipient AND d.status = 'sent'"
+                ") ORDER BY r.rowid",
+                (campaign_id,),
+            ).fetchall()
+        return [recipient for (recipient,) in rows]
+
+    def close(self) -> None:
+        """Grava os registros pendentes e fecha a conexão."""
+        self.flush()
+        with self._db_lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+@lru_cache()
+def get_delivery_journal() -> Optional[DeliveryJournal]:
+    """Retorna o journal singleton, ou None se estiver desligado."""
+    if not settings.DELIVERY_JOURNAL_ENABLED:
+        return None
+    return DeliveryJournal(
+        path=settings.DELIVERY_JOURNAL_PATH,
+        batch_size=settings.DELIVERY_JOURNAL_BATCH_SIZE,
+        flush_interval=settings.DELIVERY_JOURNAL_FLUSH_INTERVAL,
+    )
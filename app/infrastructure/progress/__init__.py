@@ -0,0 +1 @@
+"""Módulo de progresso de campanhas da infraestrutura."""
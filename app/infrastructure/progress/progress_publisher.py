@@ -0,0 +1,123 @@
+"""Publicação em lote do progresso de campanhas pelos workers.
+
+Cada resultado de envio vira um evento acumulado em memória. Os eventos são
+enviados ao Redis em lote (um único pipeline por flush) quando o buffer
+atinge `PROGRESS_BATCH_SIZE` ou a cada `PROGRESS_FLUSH_INTERVAL` segundos:
+os contadores da campanha são incrementados e os eventos publicados no
+canal pub/sub da campanha, consumido pelo endpoint de streaming.
+
+Cada lote recebe um número de sequência (campo `seq` do hash), incrementado
+atomicamente junto com os contadores. Quem lê o hash depois de assinar o
+canal descarta os lotes com `seq` já contabilizado no snapshot.
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.infrastructure.cache.redis_client import get_redis_client
+from app.utils.batching import BatchWriter
+
+
+def progress_key(campaign_id: str) -> str:
+    """Retorna a chave Redis com os contadores de progresso da campanha."""
+    return f"campaign:{campaign_id}:progress"
+
+
+def progress_channel(campaign_id: str) -> str:
+    """Retorna o canal pub/sub com os eventos de progresso da campanha."""
+    return f"campaign:{campaign_id}:progress:events"
+
+
+# Incrementa a sequência e os contadores e publica o lote em um único passo.
+# ARGV: ttl, canal, eventos (JSON), seguidos de pares status/quantidade.
+_PUBLISH_SCRIPT = """
+local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+for i = 4, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('PUBLISH', ARGV[2], '{"seq": ' .. seq .. ', "events": ' .. ARGV[3] .. '}')
+return seq
+"""
+
+
+def initialize_campaign_progress(campaign_id: str, total: int) -> None:
+    """
+    Registra o total de envios de uma campanha e zera os contadores.
+
+    Usado ao criar a campanha e ao reenfileirar os envios pendentes: o
+    progresso passa a acompanhar apenas as mensagens enfileiradas agora.
+    A sequência dos lotes é mantida.
+
+    Args:
+        campaign_id: Identificador da campanha
+        total: Quantidade de e-mails enfileirados
+    """
+    counters = {status: 0 for status in ("sent", "failed", "cancelled", "retrying")}
+    pipe = get_redis_client().pipeline()
+    pipe.hset(progress_key(campaign_id), mapping={"total": total, **counters})
+    pipe.expire(progress_key(campaign_id), settings.CAMPAIGN_STATE_TTL)
+    pipe.execute()
+
+
+class ProgressPublisher(BatchWriter):
+    """Buffer de eventos de progresso com flush por tamanho ou tempo."""
+
+    def publish(
+        self,
+        campaign_id: str,
+        task_id: Optional[str],
+        to: str,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Adiciona um evento de progresso ao buffer.
+
+        Args:
+            campaign_id: Campanha do envio
+            task_id: Tarefa Celery do envio
+            to: Destinatário
+            status: sent, failed, retrying ou cancelled
+            error: Mensagem de erro (se houver)
+        """
+        self.add(
+            {
+                "campaign_id": campaign_id,
+                "task_id": task_id,
+                "to": to,
+                "status": status,
+                "error": error,
+                "at": time.time(),
+            }
+        )
+
+    def _write(self, batch: List[dict]) -> None:
+        """Envia os eventos acumulados ao Redis em um único pipeline."""
+        by_campaign: Dict[str, List[dict]] = defaultdict(list)
+        for event in batch:
+            by_campaign[event["campaign_id"]].append(event)
+
+        client = get_redis_client()
+        script = client.register_script(_PUBLISH_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for campaign_id, events in by_campaign.items():
+            args = [settings.CAMPAIGN_STATE_TTL, progress_channel(campaign_id), json.dumps(events)]
+            for status, count in Counter(event["status"] for event in events).items():
+                args += [status, count]
+            script(keys=[progress_key(campaign_id)], args=args, client=pipe)
+        pipe.execute()
+
+
+_publisher = ProgressPublisher(
+    batch_size=settings.PROGRESS_BATCH_SIZE,
+    flush_interval=settings.PROGRESS_FLUSH_INTERVAL,
+)
+
+
+def get_progress_publisher() -> ProgressPublisher:
+    """Retorna o publicador de progresso do processo."""
+    return _publisher
@@ -0,0 +1,189 @@
+"""Streaming (Server-Sent Events) do progresso agregado de campanhas.
+
+Uma conexão SSE assina o canal pub/sub da campanha e envia ao cliente, a
+cada `PROGRESS_STREAM_INTERVAL` segundos, um único resumo com os contadores
+e as falhas recentes, em vez de um evento por e-mail.
+
+O canal é assinado antes de ler os contadores persistidos; lotes com número
+de sequência já incluído no snapshot são descartados, então nenhum envio é
+contado duas vezes nem perdido entre a leitura e a assinatura.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, Iterable, Optional, Set
+
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+from app.infrastructure.progress.progress_publisher import progress_channel, progress_key
+
+# Status que encerram o processamento de um envio
+TERMINAL_STATUSES = ("sent", "failed", "cancelled")
+
+
+class ProgressAggregator:
+    """Agrega eventos de progresso em contadores e falhas recentes.
+
+    Com `task_ids`, apenas as tarefas informadas da campanha são contadas e
+    cada tarefa é finalizada uma única vez.
+    """
+
+    def __init__(
+        self,
+        campaign_id: str,
+        task_ids: Optional[Iterable[str]] = None,
+        total: Optional[int] = None,
+        recent_failures: int = 20,
+    ):
+        self.campaign_id = campaign_id
+        self.task_ids: Optional[Set[str]] = set(task_ids) if task_ids else None
+        if total is None and self.task_ids:
+            total = len(self.task_ids)
+        self.total = total
+        self.counts: Dict[str, int] = {status: 0 for status in TERMINAL_STATUSES}
+        self.counts["retrying"] = 0
+        self.recent_failures: Deque[dict] = deque(maxlen=recent_failures)
+        self.seq = 0
+        self._finished_tasks: Set[str] = set()
+        self.dirty = True
+
+    def load_counts(self, counts: Dict[str, str]) -> None:
+        """Carrega os contadores já persistidos no Redis e a sequência do snapshot."""
+        for field, value in counts.items():
+            if field == "seq":
+                self.seq = int(value)
+            elif field == "total":
+                self.total = int(value)
+            else:
+                self.counts[field] = int(value)
+        self.dirty = True
+
+    def seed_task_status(self, task_id: str, status: str) -> None:
+        """Registra o status de uma tarefa que já terminou antes do stream começar."""
+        self.apply([{"task_id": task_id, "status": status}])
+
+    def apply_batch(self, batch: dict) -> None:
+        """Aplica um lote publicado pelos workers, ignorando os já contabilizados."""
+        seq = batch.get("seq", 0)
+        if self.task_ids is None and seq <= self.seq:
+            return
+        self.seq = max(self.seq, seq)
+        self.apply(batch["events"])
+
+    def apply(self, events: Iterable[dict]) -> None:
+        """Aplica um lote de eventos publicado pelos workers."""
+        for event in events:
+            task_id = event.get("task_id")
+            if self.task_ids is not None:
+                if task_id not in self.task_ids or task_id in self._finished_tasks:
+                    continue
+                if event["status"] in TERMINAL_STATUSES:
+                    self._finished_tasks.add(task_id)
+
+            status = event["status"]
+            self.counts[status] = self.counts.get(status, 0) + 1
+            if status in ("failed", "retrying"):
+                self.recent_failures.append(
+                    {
+                        "task_id": task_id,
+                        "to": event.get("to"),
+                        "status": status,
+                        "error": event.get("error"),
+                        "at": event.get("at"),
+                    }
+                )
+            self.dirty = True
+
+    @property
+    def done(self) -> int:
+        """Quantidade de envios finalizados."""
+        return sum(self.counts.get(status, 0) for status in TERMINAL_STATUSES)
+
+    @property
+    def finished(self) -> bool:
+        """Indica se todos os envios acompanhados foram finalizados."""
+        return self.total is not None and self.done >= self.total
+
+    def snapshot(self) -> dict:
+        """Retorna o resumo atual do progresso."""
+        self.dirty = False
+        return {
+            "campaign_id": self.campaign_id,
+            "total": self.total,
+            "done": self.done,
+            "counts": dict(self.counts),
+            "recent_failures": list(self.recent_failures),
+            "finished": self.finished,
+        }
+
+
+def format_sse(data: dict, event: str = "progress") -> str:
+    """Formata um evento no protocolo Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_progress(
+    client: AsyncRedis,
+    aggregator: ProgressAggregator,
+    interval: Optional[float] = None,
+    heartbeat: Optional[float] = None,
+    max_duration: Optional[float] = None,
+    seed: Optional[Callable[[ProgressAggregator], None]] = None,
+) -> AsyncIterator[str]:
+    """
+    Gera eventos SSE com o progresso agregado até a conclusão dos envios.
+
+    Args:
+        client: Cliente Redis assíncrono (fechado ao final do stream)
+        aggregator: Agregador da campanha ou do conjunto de tarefas
+        interval: Intervalo entre resumos (default: `PROGRESS_STREAM_INTERVAL`)
+        heartbeat: Intervalo máximo sem enviar dados (default: `PROGRESS_STREAM_HEARTBEAT`)
+        max_duration: Duração máxima do stream (default: `PROGRESS_STREAM_MAX_DURATION`)
+        seed: Função síncrona que registra resultados anteriores ao stream;
+            executada em uma thread depois de assinar o canal
+
+    Yields:
+        Eventos SSE formatados
+    """
+    interval = interval or settings.PROGRESS_STREAM_INTERVAL
+    heartbeat = heartbeat or settings.PROGRESS_STREAM_HEARTBEAT
+    max_duration = max_duration or settings.PROGRESS_STREAM_MAX_DURATION
+    pubsub = client.pubsub()
+
+    try:
+        # Assina antes de ler o estado atual para não perder lotes publicados no meio
+        await pubsub.subscribe(progress_channel(aggregator.campaign_id))
+        if aggregator.task_ids is None:
+            aggregator.load_counts(await client.hgetall(progress_key(aggregator.campaign_id)))
+        if seed is not None:
+            await asyncio.to_thread(seed, aggregator)
+
+        started = last_sent = time.monotonic()
+        while True:
+            deadline = time.monotonic() + interval
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if message and message.get("type") == "message":
+                    aggregator.apply_batch(json.loads(message["data"]))
+
+            if aggregator.dirty:
+                yield format_sse(aggregator.snapshot())
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= heartbeat:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            if aggregator.finished:
+                yield format_sse(aggregator.snapshot(), event="finished")
+                break
+            if time.monotonic() - started >= max_duration:
+                yield format_sse(aggregator.snapshot(), event="timeout")
+                break
+    finally:
+        await pubsub.close()
+        await client.close()
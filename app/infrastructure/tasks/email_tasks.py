@@ -1,13 +1,70 @@
 """Tarefas Celery para envio de e-mails."""
 
+import time
 from typing import Optional
 from celery import Task
-from app.core.celery_app import celery_app
-from app.domain.entities import EmailMessage
+from celery.exceptions import Ignore
+from celery.signals import worker_process_shutdown
+from app.core.celery_app import SEND_EMAIL_TASK_NAME, celery_app
+from app.domain.entities import CampaignState, EmailMessage
+from app.infrastructure.campaigns.campaign_control import get_cached_campaign_state, park_message
+from app.infrastructure.delivery.concurrency import get_delivery_limiter
 from app.infrastructure.email.mail_client import send_email
+from app.infrastructure.email.transports import get_transport
+from app.infrastructure.journal.delivery_journal import get_delivery_journal
+from app.infrastructure.progress.progress_publisher import get_progress_publisher
 from app.utils.logger import logger
 
 
+@worker_process_shutdown.connect
+def _close_transport(**kwargs) -> None:
+    """Grava mensagens pendentes do transporte ao encerrar o processo do worker."""
+    try:
+        get_transport().close()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error(f"Erro ao encerrar transporte de e-mail: {exc}")
+
+
+@worker_process_shutdown.connect
+def _flush_progress(**kwargs) -> None:
+    """Publica eventos de progresso pendentes ao encerrar o processo do worker."""
+    get_progress_publisher().flush()
+
+
+@worker_process_shutdown.connect
+def _flush_delivery_limiter(**kwargs) -> None:
+    """Aplica os resultados pendentes ao controle de concorrência ao encerrar o processo."""
+    limiter = get_delivery_limiter()
+    if limiter is not None:
+        limiter.flush()
+
+
+@worker_process_shutdown.connect
+def _close_journal(**kwargs) -> None:
+    """Grava os registros pendentes do journal ao encerrar o processo do worker."""
+    journal = get_delivery_journal()
+    if journal is not None:
+        journal.close()
+
+
+def _record_outcome(
+    campaign_id: Optional[str],
+    task_id: Optional[str],
+    to: str,
+    status: str,
+    error: Optional[str] = None,
+) -> None:
+    """Registra o resultado do envio no progresso e no journal da campanha (se houver)."""
+    if not campaign_id:
+        return
+    get_progress_publisher().publish(campaign_id, task_id, to, status, error)
+
+    # Tentativas intermediárias não são gravadas: apenas o resultado final importa
+    journal = get_delivery_journal()
+    if journal is not None and status != "retrying":
+        journal.record(campaign_id, to, task_id, status, error)
+
+
 class EmailTask(Task):
     """Classe base para tarefas de e-mail com retry automático."""
 
@@ -22,8 +79,48 @@ class EmailTask(Task):
         logger.error(f"Tarefa {task_id} falhou: {exc}")
 
 
+def _acquire_delivery_slot() -> str:
+    """
+    Aguarda um slot do controle adaptativo de concorrência.
+
+    A tarefa fica retida no processo do worker até um slot ser liberado, sem
+    ser republicada; com `worker_prefetch_multiplier=1` o processo não
+    consome novas mensagens enquanto espera. A espera é limitada pelo
+    `task_time_limit` do Celery.
+
+    Returns:
+        Token do slot ("" se o controle estiver desligado ou indisponível)
+    """
+    limiter = get_delivery_limiter()
+    if limiter is None:
+        return ""
+
+    delay = 0.05
+    while True:
+        try:
+            token = limiter.acquire()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"Controle de concorrência indisponível, enviando sem limite: {exc}")
+            return ""
+        if token is not None:
+            return token
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+
+def _release_delivery_slot(token: str) -> None:
+    """Libera um slot obtido por `_acquire_delivery_slot`."""
+    limiter = get_delivery_limiter()
+    if limiter is None or not token:
+        return
+    try:
+        limiter.release(token)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning(f"Falha ao liberar slot de envio: {exc}")
+
+
 @celery_app.task(
-    name="send_email_task",
+    name=SEND_EMAIL_TASK_NAME,
     base=EmailTask,
     bind=True,
     autoretry_for=(Exception,),
@@ -38,6 +135,7 @@ def send_email_task(
     subject: str,
     body: str,
     from_email: Optional[str] = None,
+    campaign_id: Optional[str] = None,
 ) -> dict:
     """
     Tarefa Celery para envio de um único e-mail.
@@ -48,24 +146,60 @@ def send_email_task(
         subject: Assunto do e-mail
         body: Corpo do e-mail
         from_email: Remetente do e-mail (opcional)
+        campaign_id: Campanha à qual o envio pertence (opcional)
 
     Returns:
         Dicionário com resultado do envio
     """
+    # Verifica o estado da campanha antes de qualquer envio
+    if campaign_id:
+        state = get_cached_campaign_state(campaign_id)
+        if state == CampaignState.PAUSED:
+            # Estaciona a mensagem no Redis até a campanha ser retomada ou cancelada;
+            # o estado é confirmado atomicamente, então uma retomada recente não a perde
+            kwargs = {
+                "to": to,
+                "subject": subject,
+                "body": body,
+                "from_email": from_email,
+                "campaign_id": campaign_id,
+            }
+            state = park_message(campaign_id, self.request.id, kwargs)
+            if state == CampaignState.PAUSED:
+                logger.info(f"Envio para {to} estacionado: campanha {campaign_id} pausada")
+                raise Ignore()
+        if state == CampaignState.CANCELLED:
+            logger.info(f"Envio para {to} ignorado: campanha {campaign_id} cancelada")
+            _record_outcome(campaign_id, self.request.id, to, "cancelled")
+            return {
+                "status": "cancelled",
+                "to": to,
+                "task_id": self.request.id,
+                "campaign_id": campaign_id,
+            }
+
+    # Respeita o limite adaptativo de envios simultâneos
+    slot = _acquire_delivery_slot()
+
     try:
-        # Cria entidade de domínio
-        message = EmailMessage(
-            to=to,
-            subject=subject,
-            body=body,
-            from_email=from_email,
-        )
+        # O slot é liberado uma única vez, inclusive se a falha ocorrer antes do envio
+        try:
+            # Cria entidade de domínio
+            message = EmailMessage(
+                to=to,
+                subject=subject,
+                body=body,
+                from_email=from_email,
+            )
 
-        # Envia e-mail usando cliente SMTP
-        success = send_email(message)
+            # Envia e-mail usando o transporte configurado
+            success = send_email(message)
+        finally:
+            _release_delivery_slot(slot)
 
         if success:
             logger.info(f"E-mail enviado com sucesso para {to} (task_id: {self.request.id})")
+            _record_outcome(campaign_id, self.request.id, to, "sent")
             return {
                 "status": "sent",
                 "to": to,
@@ -95,6 +229,10 @@ def send_email_task(
             "to": to,
         }
         logger.error(error_message)
+        final = self.request.retries >= self.max_retries
+        _record_outcome(
+            campaign_id, failure_meta["task_id"], to, "failed" if final else "retrying", str(e)
+        )
         try:
             self.update_state(  # type: ignore[attr-defined]
                 state="FAILURE",
@@ -0,0 +1,82 @@
+"""Buffer em memória com gravação em lote por tamanho ou tempo."""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+
+from app.utils.logger import logger
+
+
+class BatchWriter(ABC):
+    """Acumula itens e os grava em lote.
+
+    O lote é gravado quando o buffer atinge `batch_size` itens ou, por uma
+    thread de fundo, a cada `flush_interval` segundos. A thread é criada no
+    primeiro `add` de cada processo, então é seguro instanciar a classe antes
+    do fork dos workers do Celery.
+
+    Se `retain_on_error` for True, um lote que falhou volta para o buffer e
+    é gravado novamente no próximo flush; caso contrário é descartado. O
+    buffer retido é limitado a `max_retained_batches` lotes: enquanto o
+    destino continuar falhando, os itens mais antigos excedentes são
+    descartados (e registrados no log) para não esgotar a memória.
+    """
+
+    retain_on_error = False
+    max_retained_batches = 10
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Any] = []
+        self._lock = threading.Lock()
+        self._flusher_pid: Optional[int] = None
+
+    @abstractmethod
+    def _write(self, batch: List[Any]) -> None:
+        """Grava um lote de itens."""
+
+    def _ensure_flusher(self) -> None:
+        """Inicia a thread de flush periódico no processo atual."""
+        if self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        thread.start()
+
+    def _flush_periodically(self) -> None:
+        """Grava o buffer a cada `flush_interval` segundos."""
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def add(self, item: Any) -> None:
+        """Adiciona um item ao buffer e grava o lote se estiver cheio."""
+        with self._lock:
+            self._buffer.append(item)
+            should_flush = len(self._buffer) >= self.batch_size
+        self._ensure_flusher()
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Grava todos os itens pendentes."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        try:
+            self._write(batch)
+        except Exception as exc:  # pylint: disable=broad-except
+            name = type(self).__name__
+            logger.error(f"Falha ao gravar lote de {len(batch)} itens em {name}: {exc}")
+            if self.retain_on_error:
+                with self._lock:
+                    self._buffer[:0] = batch
+                    excess = len(self._buffer) - self.batch_size * self.max_retained_batches
+                    if excess > 0:
+                        del self._buffer[:excess]
+                if excess > 0:
+                    logger.error(f"{excess} itens descartados de {name}: limite do buffer atingido")
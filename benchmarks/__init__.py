@@ -0,0 +1 @@
+"""Benchmarks da aplicação."""
@@ -0,0 +1,96 @@
+"""Benchmark de inicialização dos processos da API e do worker.
+
+Mede, em um interpretador novo para cada amostra, o tempo de importação e a
+memória residente (pico) do módulo carregado por cada processo:
+
+- api: `app.main` (carregado pelo uvicorn)
+- worker: `app.infrastructure.tasks.email_tasks` (incluído pelo Celery)
+
+Uso:
+    python -m benchmarks.startup [--runs 5] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+TARGETS: Dict[str, str] = {
+    "api": "app.main",
+    "worker": "app.infrastructure.tasks.email_tasks",
+}
+
+# Módulos que a API não deve carregar
+HEAVY_MODULES: List[str] = ["fastapi_mail", "app.infrastructure.tasks.email_tasks"]
+
+_PROBE = """
+import importlib, json, resource, sys, time
+
+def rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+baseline = rss_kb()
+started = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "rss_kb": rss_kb(),
+    "rss_delta_kb": rss_kb() - baseline,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Importa o módulo em um subprocesso e retorna as métricas coletadas."""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(runs: int) -> Dict[str, dict]:
+    """Executa o benchmark de todos os processos."""
+    results = {}
+    for name, module in TARGETS.items():
+        samples = [measure(module) for _ in range(runs)]
+        results[name] = {
+            "module": module,
+            "import_ms_median": statistics.median(s["import_ms"] for s in samples),
+            "import_ms_min": min(s["import_ms"] for s in samples),
+            "rss_kb_median": statistics.median(s["rss_kb"] for s in samples),
+            "rss_delta_kb_median": statistics.median(s["rss_delta_kb"] for s in samples),
+            "loaded": samples[-1]["loaded"],
+        }
+    return results
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Amostras por processo")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'processo':<8} {'import (ms)':>12} {'RSS (MB)':>10} {'+RSS (MB)':>10}  módulos pesados")
+    for name, result in results.items():
+        print(
+            f"{name:<8} {result['import_ms_median']:>12.1f} "
+            f"{result['rss_kb_median'] / 1024:>10.1f} "
+            f"{result['rss_delta_kb_median'] / 1024:>10.1f}  "
+            f"{', '.join(result['loaded']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
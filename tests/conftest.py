@@ -0,0 +1,57 @@
+"""Fixtures compartilhadas dos testes."""
+
+import pytest
+
+from app.api import routes
+from app.infrastructure.email import mail_client
+from app.infrastructure.journal.delivery_journal import DeliveryJournal
+from app.infrastructure.tasks import email_tasks
+
+
+@pytest.fixture(autouse=True)
+def disable_delivery_limiter():
+    """Desliga o controle adaptativo de concorrência, que depende do Redis."""
+    originals = (mail_client.get_delivery_limiter, email_tasks.get_delivery_limiter)
+    mail_client.get_delivery_limiter = lambda: None
+    email_tasks.get_delivery_limiter = lambda: None
+    try:
+        yield
+    finally:
+        mail_client.get_delivery_limiter, email_tasks.get_delivery_limiter = originals
+
+
+class _NullProgressPublisher:
+    """Publicador de progresso que não acessa o Redis."""
+
+    def publish(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def disable_progress_publisher():
+    """Evita que as tarefas executadas nos testes publiquem progresso no Redis."""
+    original = email_tasks.get_progress_publisher
+    email_tasks.get_progress_publisher = lambda: _NullProgressPublisher()
+    try:
+        yield
+    finally:
+        email_tasks.get_progress_publisher = original
+
+
+@pytest.fixture(autouse=True)
+def delivery_journal(tmp_path):
+    """Usa um journal de entregas temporário em cada teste."""
+    journal = DeliveryJournal(
+        str(tmp_path / "journal.sqlite3"), batch_size=1000, flush_interval=3600
+    )
+    originals = (routes.get_delivery_journal, email_tasks.get_delivery_journal)
+    routes.get_delivery_journal = lambda: journal
+    email_tasks.get_delivery_journal = lambda: journal
+    try:
+        yield journal
+    finally:
+        routes.get_delivery_journal, email_tasks.get_delivery_journal = originals
+        journal.close()
@@ -5,8 +5,8 @@ import uuid
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.celery_app import celery_app
 from app.main import app
-from app.infrastructure.tasks import email_tasks
 
 client = TestClient(app)
 
@@ -46,11 +46,11 @@ def test_send_emails_valid_request():
         def __init__(self):
             self.id = str(uuid.uuid4())
 
-    def _fake_delay(*args, **kwargs):
+    def _fake_send_task(*args, **kwargs):
         return _FakeAsyncResult()
 
-    original_delay = email_tasks.send_email_task.delay
-    email_tasks.send_email_task.delay = _fake_delay
+    original_send_task = celery_app.send_task
+    celery_app.send_task = _fake_send_task
 
     try:
         response = client.post(
@@ -62,7 +62,7 @@ def test_send_emails_valid_request():
             },
         )
     finally:
-        email_tasks.send_email_task.delay = original_delay
+        celery_app.send_task = original_send_task
 
     # Deve aceitar a requisição (202) mesmo que não envie de fato
     assert response.status_code == 202
@@ -0,0 +1,214 @@
+"""Testes do controle de campanhas."""
+
+import contextlib
+import json
+
+import pytest
+from celery.exceptions import Ignore
+from fastapi.testclient import TestClient
+
+from app.domain.entities import CampaignState
+from app.infrastructure.campaigns import campaign_control
+from app.infrastructure.tasks import email_tasks
+from app.main import app
+
+client = TestClient(app)
+
+
+class _FakeRedis:
+    """Substituto mínimo do cliente Redis para os testes."""
+
+    def __init__(self):
+        self.data = {}
+        self.get_calls = 0
+
+    def get(self, key):
+        self.get_calls += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def rpush(self, key, value):
+        self.data.setdefault(key, []).append(value)
+
+    def lrange(self, key, start, end):
+        return list((self.data.get(key) or [])[start : end + 1])
+
+    def ltrim(self, key, start, end):
+        self.data[key] = (self.data.get(key) or [])[start:]
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return contextlib.nullcontext()
+
+    def register_script(self, script):
+        """Emula os scripts Lua do controle de campanhas."""
+
+        def _set_state(keys, args):
+            current = self.data.get(keys[0])
+            if current == "cancelled" and args[0] != "cancelled":
+                return current
+            self.set(keys[0], args[0])
+            return args[0]
+
+        def _park(keys, args):
+            state = self.data.get(keys[0])
+            if state == "paused":
+                self.rpush(keys[1], args[0])
+            return state or "active"
+
+        if script == campaign_control._SET_STATE_SCRIPT:
+            return _set_state
+        return _park
+
+
+@pytest.fixture
+def fake_redis():
+    """Substitui o cliente Redis usado pelo controle de campanhas."""
+    fake = _FakeRedis()
+    original = campaign_control.get_redis_client
+    campaign_control.get_redis_client = lambda: fake
+    campaign_control._state_cache.clear()
+    try:
+        yield fake
+    finally:
+        campaign_control.get_redis_client = original
+        campaign_control._state_cache.clear()
+
+
+def test_campaign_state_defaults_to_active(fake_redis):
+    """Campanhas sem registro são consideradas ativas."""
+    assert campaign_control.get_campaign_state("c1") == CampaignState.ACTIVE
+
+
+def test_cancelled_campaign_cannot_be_resumed(fake_redis):
+    """Cancelamento é irreversível."""
+    campaign_control.set_campaign_state("c1", CampaignState.CANCELLED)
+    with pytest.raises(campaign_control.CampaignStateError):
+        campaign_control.set_campaign_state("c1", CampaignState.ACTIVE)
+
+
+def test_cached_state_avoids_redis_round_trips(fake_redis):
+    """O cache local evita consultas repetidas ao Redis."""
+    for _ in range(5):
+        campaign_control.get_cached_campaign_state("c1")
+    assert fake_redis.get_calls == 1
+
+
+def test_campaign_endpoints(fake_redis):
+    """Testa pausa, retomada e cancelamento via API."""
+    response = client.post("/api/v1/campaigns/c1/pause")
+    assert response.status_code == 200
+    assert response.json()["state"] == "paused"
+
+    response = client.post("/api/v1/campaigns/c1/resume")
+    assert response.json()["state"] == "active"
+
+    response = client.post("/api/v1/campaigns/c1/cancel")
+    assert response.json()["state"] == "cancelled"
+
+    response = client.post("/api/v1/campaigns/c1/resume")
+    assert response.status_code == 409
+
+    response = client.get("/api/v1/campaigns/c1/state")
+    assert response.json()["state"] == "cancelled"
+
+
+def test_task_skips_cancelled_campaign(fake_redis):
+    """Tarefas de campanhas canceladas não enviam e-mail."""
+    fake_redis.data["campaign:c1:state"] = "cancelled"
+    original_send = email_tasks.send_email
+    email_tasks.send_email = lambda message: pytest.fail("e-mail não deveria ser enviado")
+    try:
+        result = email_tasks.send_email_task.run(
+            to="test@example.com", subject="Test", body="Body", campaign_id="c1"
+        )
+    finally:
+        email_tasks.send_email = original_send
+
+    assert result["status"] == "cancelled"
+
+
+def test_task_parks_paused_campaign(fake_redis):
+    """Tarefas de campanhas pausadas são estacionadas no Redis, sem envio."""
+    fake_redis.data["campaign:c1:state"] = "paused"
+    email_tasks.send_email_task.update_state = lambda *a, **kw: pytest.fail("sem escrita")
+    try:
+        with pytest.raises(Ignore):
+            email_tasks.send_email_task.run(
+                to="test@example.com", subject="Test", body="Body", campaign_id="c1"
+            )
+    finally:
+        del email_tasks.send_email_task.update_state
+
+    (parked,) = fake_redis.data["campaign:c1:parked"]
+    assert json.loads(parked)["kwargs"]["to"] == "test@example.com"
+
+
+def test_task_sends_when_resumed_after_cached_pause(fake_redis):
+    """Se a campanha foi retomada após o cache local, a mensagem é enviada."""
+    campaign_control._state_cache["c1"] = (CampaignState.PAUSED, float("inf"))
+    original_send = email_tasks.send_email
+    email_tasks.send_email = lambda message: True
+    try:
+        result = email_tasks.send_email_task.run(
+            to="test@example.com", subject="Test", body="Body", campaign_id="c1"
+        )
+    finally:
+        email_tasks.send_email = original_send
+
+    assert result["status"] == "sent"
+    assert "campaign:c1:parked" not in fake_redis.data
+
+
+def test_resume_requeues_parked_messages(fake_redis, monkeypatch):
+    """Ao retomar, as mensagens estacionadas são republicadas com o task_id original."""
+    published = []
+    monkeypatch.setattr(
+        campaign_control.celery_app,
+        "send_task",
+        lambda name, kwargs, task_id: published.append((task_id, kwargs["to"])),
+    )
+    campaign_control.set_campaign_state("c1", CampaignState.PAUSED)
+    for index in range(3):
+        state = campaign_control.park_message("c1", f"t{index}", {"to": f"u{index}@x.com"})
+        assert state == CampaignState.PAUSED
+
+    response = client.post("/api/v1/campaigns/c1/resume")
+
+    assert response.json()["requeued"] == 3
+    assert published == [("t0", "u0@x.com"), ("t1", "u1@x.com"), ("t2", "u2@x.com")]
+
+
+def test_requeue_keeps_unpublished_messages_on_broker_failure(fake_redis, monkeypatch):
+    """Se o broker falha no meio do lote, as mensagens não publicadas continuam estacionadas."""
+    published = []
+
+    def _flaky_send_task(name, kwargs, task_id):
+        if task_id == "t1":
+            raise ConnectionError("broker indisponível")
+        published.append(task_id)
+
+    monkeypatch.setattr(campaign_control.celery_app, "send_task", _flaky_send_task)
+    campaign_control.set_campaign_state("c1", CampaignState.PAUSED)
+    for index in range(3):
+        campaign_control.park_message("c1", f"t{index}", {"to": f"u{index}@x.com"})
+    campaign_control.set_campaign_state("c1", CampaignState.ACTIVE)
+
+    with pytest.raises(ConnectionError):
+        campaign_control.requeue_parked_messages("c1")
+    assert published == ["t0"]
+    remaining = [json.loads(item)["task_id"] for item in fake_redis.data["campaign:c1:parked"]]
+    assert remaining == ["t1", "t2"]
+
+    monkeypatch.setattr(
+        campaign_control.celery_app,
+        "send_task",
+        lambda name, kwargs, task_id: published.append(task_id),
+    )
+    assert campaign_control.requeue_parked_messages("c1") == 2
+    assert published == ["t0", "t1", "t2"]
+    assert fake_redis.data["campaign:c1:parked"] == []
@@ -0,0 +1,288 @@
+"""Testes do controle adaptativo de concorrência."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.infrastructure.delivery.concurrency import AIMDController, DeliveryLimiter
+from app.infrastructure.tasks import email_tasks
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_aimd_increases_additively_when_healthy():
+    """Envios saudáveis aumentam o limite em ~1 por janela de `limit` envios."""
+    controller = AIMDController(limit=4.0, max_limit=32.0)
+    decisions = [controller.on_success(latency=0.1, now=float(i)) for i in range(4)]
+    assert decisions == [None, None, None, None]
+    assert 4.9 < controller.limit < 5.0
+
+    decision = controller.on_success(latency=0.1, now=5.0)
+    assert decision["action"] == "increase"
+    assert (decision["previous_limit"], decision["limit"]) == (4, 5)
+
+
+def test_aimd_only_increases_when_limit_is_in_use():
+    """O limite não cresce além do que os workers conseguem ocupar."""
+    controller = AIMDController(limit=16.0, max_limit=32.0)
+    for i in range(100):
+        assert controller.on_success(latency=0.1, now=float(i), in_flight=8) is None
+    assert controller.limit == 16.0
+
+    for i in range(20):
+        controller.on_success(latency=0.1, now=float(i), in_flight=15)
+    assert controller.limit > 16.0
+
+
+def test_aimd_cuts_multiplicatively_on_deferral():
+    """Deferrals 4xx e timeouts reduzem o limite pela metade."""
+    controller = AIMDController(limit=16.0, cooldown=5.0)
+
+    decision = controller.on_failure(transient=True, now=100.0)
+    assert controller.limit == 8.0
+    assert decision["action"] == "decrease"
+    assert decision["reason"] == "deferral"
+
+    # Falhas dentro do cooldown não reduzem novamente
+    assert controller.on_failure(transient=True, now=101.0) is None
+    assert controller.limit == 8.0
+
+    controller.on_failure(transient=True, now=106.0)
+    assert controller.limit == 4.0
+
+
+def test_aimd_cuts_on_high_latency_and_respects_bounds():
+    """Latência acima do alvo reduz o limite, sem passar do mínimo."""
+    controller = AIMDController(limit=2.0, min_limit=1.0, latency_target=1.0, cooldown=0.0)
+    controller.on_success(latency=5.0, now=1.0)
+    controller.on_success(latency=5.0, now=2.0)
+    assert controller.limit == 1.0
+
+
+def test_aimd_permanent_errors_only_cut_above_threshold():
+    """Erros permanentes só reduzem o limite quando a taxa de erro fica alta."""
+    controller = AIMDController(limit=8.0, error_rate_threshold=0.2, cooldown=0.0)
+    assert controller.on_failure(transient=False, now=1.0) is None
+    assert controller.limit == 8.0
+
+    for i in range(5):
+        controller.on_failure(transient=False, now=2.0 + i)
+    assert controller.limit < 8.0
+
+
+def test_delivery_concurrency_endpoint():
+    """Testa a exposição do limite e das decisões aos operadores."""
+
+    class _FakeLimiter:
+        def snapshot(self):
+            return {
+                "limit": 6,
+                "in_flight": 2,
+                "error_rate": 0.05,
+                "min_limit": 1,
+                "max_limit": 32,
+                "decisions": [
+                    {
+                        "action": "decrease",
+                        "reason": "deferral",
+                        "previous_limit": 12,
+                        "limit": 6,
+                        "at": 1700000000.0,
+                    }
+                ],
+            }
+
+    original = routes.get_delivery_limiter
+    routes.get_delivery_limiter = lambda: _FakeLimiter()
+    try:
+        response = client.get("/api/v1/delivery/concurrency")
+    finally:
+        routes.get_delivery_limiter = original
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["limit"] == 6
+    assert data["decisions"][0]["reason"] == "deferral"
+
+
+def test_limiter_applies_outcomes_in_batches():
+    """Os resultados são aplicados ao estado compartilhado em uma transação por lote."""
+
+    class _FakePipeline:
+        def __init__(self, store):
+            self.store = store
+
+        def hgetall(self, key):
+            return dict(self.store.get(key, {}))
+
+        def zcount(self, key, minimum, maximum):
+            return 4
+
+        def multi(self):
+            pass
+
+        def hset(self, key, mapping):
+            self.store[key] = {field: str(value) for field, value in mapping.items()}
+
+        def lpush(self, key, *values):
+            self.store.setdefault(key, [])[:0] = values
+
+        def ltrim(self, key, start, end):
+            pass
+
+    class _FakeClient:
+        def __init__(self):
+            self.store = {}
+            self.transactions = 0
+
+        def transaction(self, func, *watches):
+            self.transactions += 1
+            func(_FakePipeline(self.store))
+
+    fake = _FakeClient()
+    limiter = DeliveryLimiter(fake, slot_lease=60, batch_size=10, flush_interval=60)
+    for _ in range(9):
+        limiter.record(success=True, latency=0.1)
+    assert fake.transactions == 0
+
+    limiter.record(success=False, latency=0.1, transient=True)
+    assert fake.transactions == 1
+    assert float(fake.store[DeliveryLimiter.STATE_KEY]["limit"]) < 4.0
+    assert len(fake.store[DeliveryLimiter.DECISIONS_KEY]) >= 1
+
+
+def test_task_releases_slot_once_on_failed_send(monkeypatch):
+    """Um envio que falha libera o slot exatamente uma vez."""
+
+    class _CountingLimiter:
+        def __init__(self):
+            self.released = []
+
+        def acquire(self):
+            return "token"
+
+        def release(self, token):
+            self.released.append(token)
+
+    limiter = _CountingLimiter()
+    monkeypatch.setattr(email_tasks, "get_delivery_limiter", lambda: limiter)
+    monkeypatch.setattr(email_tasks, "send_email", lambda message: False)
+
+    with pytest.raises(Exception):
+        email_tasks.send_email_task.run(to="test@example.com", subject="Test", body="Body")
+
+    assert limiter.released == ["token"]
+
+
+class _FakeSlotPipeline:
+    """Pipeline que executa os comandos de sorted set usados por `acquire`."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def zremrangebyscore(self, key, minimum, maximum):
+        self.calls.append(lambda: self.redis.zremrangebyscore(key, minimum, maximum))
+
+    def zadd(self, key, mapping):
+        self.calls.append(lambda: self.redis.zadd(key, mapping))
+
+    def zrank(self, key, member):
+        self.calls.append(lambda: self.redis.zrank(key, member))
+
+    def hget(self, key, field):
+        self.calls.append(lambda: self.redis.hashes.get(key, {}).get(field))
+
+    def execute(self):
+        return [call() for call in self.calls]
+
+
+class _FakeSlotRedis:
+    """Sorted sets e hashes em memória, suficientes para `acquire`/`release`."""
+
+    def __init__(self, limit):
+        self.zsets = {}
+        self.hashes = {DeliveryLimiter.STATE_KEY: {"limit": str(limit)}}
+
+    def pipeline(self):
+        return _FakeSlotPipeline(self)
+
+    def zremrangebyscore(self, key, minimum, maximum):
+        zset = self.zsets.setdefault(key, {})
+        for member in [member for member, score in zset.items() if score <= maximum]:
+            del zset[member]
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrank(self, key, member):
+        zset = self.zsets.get(key, {})
+        if member not in zset:
+            return None
+        return sorted(zset, key=lambda item: (zset[item], item)).index(member)
+
+    def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+
+def test_limiter_admits_up_to_limit_and_rejects_extra_tokens():
+    """Slots são concedidos até o limite; o token recusado é removido do conjunto."""
+    fake = _FakeSlotRedis(limit=2)
+    limiter = DeliveryLimiter(fake, slot_lease=60)
+
+    first, second = limiter.acquire(), limiter.acquire()
+    assert first and second
+    assert limiter.acquire() is None
+    assert set(fake.zsets[DeliveryLimiter.INFLIGHT_KEY]) == {first, second}
+
+    limiter.release(first)
+    third = limiter.acquire()
+    assert third is not None
+    assert set(fake.zsets[DeliveryLimiter.INFLIGHT_KEY]) == {second, third}
+
+
+def test_limiter_expires_slots_after_lease(monkeypatch):
+    """Slots de workers que morreram expiram após `slot_lease` segundos."""
+    fake = _FakeSlotRedis(limit=1)
+    limiter = DeliveryLimiter(fake, slot_lease=60)
+    clock = [1000.0]
+    monkeypatch.setattr("app.infrastructure.delivery.concurrency.time.time", lambda: clock[0])
+
+    stale = limiter.acquire()
+    assert stale is not None
+    clock[0] += 1
+    assert limiter.acquire() is None
+
+    clock[0] += 61
+    fresh = limiter.acquire()
+    assert fresh is not None
+    assert set(fake.zsets[DeliveryLimiter.INFLIGHT_KEY]) == {fresh}
+
+
+def test_acquire_delivery_slot_waits_until_a_slot_frees(monkeypatch):
+    """A tarefa aguarda com backoff até obter um slot, sem ser republicada."""
+    tokens = [None, None, "token"]
+    sleeps = []
+
+    class _BusyLimiter:
+        def acquire(self):
+            return tokens.pop(0)
+
+    monkeypatch.setattr(email_tasks, "get_delivery_limiter", lambda: _BusyLimiter())
+    monkeypatch.setattr(email_tasks.time, "sleep", sleeps.append)
+
+    assert email_tasks._acquire_delivery_slot() == "token"
+    assert sleeps == [0.05, 0.1]
+
+
+def test_acquire_delivery_slot_fails_open_when_redis_is_down(monkeypatch):
+    """Se o Redis estiver indisponível, o envio segue sem limite."""
+
+    class _BrokenLimiter:
+        def acquire(self):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(email_tasks, "get_delivery_limiter", lambda: _BrokenLimiter())
+    assert email_tasks._acquire_delivery_slot() == ""
@@ -0,0 +1,106 @@
+"""Testes do journal de entregas."""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.celery_app import celery_app
+from app.domain.entities import CampaignState, EmailCampaign
+from app.infrastructure.tasks import email_tasks
+from app.main import app
+
+client = TestClient(app)
+
+
+def _campaign(campaign_id: str = "c1") -> EmailCampaign:
+    return EmailCampaign(
+        emails=["a@example.com", "b@example.com", "c@example.com"],
+        subject="Test",
+        body="Test body",
+        campaign_id=campaign_id,
+    )
+
+
+def test_journal_group_commits_and_lists_unsent(delivery_journal):
+    """Somente destinatários com envio registrado deixam de ser pendentes."""
+    delivery_journal.record_campaign(_campaign())
+    delivery_journal.record("c1", "a@example.com", "t1", "sent")
+    delivery_journal.record("c1", "b@example.com", "t2", "failed", "boom")
+
+    # Registros ainda no buffer não contam até o commit em grupo
+    assert delivery_journal.unsent_recipients("c1") == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+
+    delivery_journal.flush()
+    assert delivery_journal.unsent_recipients("c1") == ["b@example.com", "c@example.com"]
+
+
+def test_journal_rebuilds_campaign(delivery_journal):
+    """A campanha é reconstruída a partir do journal."""
+    delivery_journal.record_campaign(_campaign())
+    campaign = delivery_journal.get_campaign("c1")
+
+    assert campaign.subject == "Test"
+    assert campaign.emails == ["a@example.com", "b@example.com", "c@example.com"]
+    assert delivery_journal.get_campaign("unknown") is None
+
+
+def test_task_records_outcome_in_journal(delivery_journal):
+    """O resultado das tarefas é gravado no journal."""
+    delivery_journal.record_campaign(_campaign())
+    original_send = email_tasks.send_email
+    email_tasks.send_email = lambda message: True
+    try:
+        email_tasks.send_email_task.run(
+            to="a@example.com", subject="Test", body="Test body", campaign_id="c1"
+        )
+    finally:
+        email_tasks.send_email = original_send
+
+    delivery_journal.flush()
+    assert delivery_journal.unsent_recipients("c1") == ["b@example.com", "c@example.com"]
+
+
+def test_resume_unsent_enqueues_only_pending(delivery_journal):
+    """A retomada reenfileira apenas os destinatários sem envio registrado."""
+    delivery_journal.record_campaign(_campaign())
+    delivery_journal.record("c1", "b@example.com", "t2", "sent")
+    delivery_journal.flush()
+
+    enqueued = []
+
+    class _FakeAsyncResult:
+        def __init__(self):
+            self.id = str(uuid.uuid4())
+
+    def _fake_send_task(name, kwargs):
+        enqueued.append(kwargs["to"])
+        return _FakeAsyncResult()
+
+    progress = []
+    original_send_task = celery_app.send_task
+    original_state = routes.get_campaign_state
+    original_progress = routes.initialize_campaign_progress
+    celery_app.send_task = _fake_send_task
+    routes.get_campaign_state = lambda campaign_id: CampaignState.ACTIVE
+    routes.initialize_campaign_progress = lambda campaign_id, total: progress.append(
+        (campaign_id, total)
+    )
+    try:
+        response = client.post("/api/v1/campaigns/c1/resume-unsent")
+        missing = client.post("/api/v1/campaigns/unknown/resume-unsent")
+    finally:
+        celery_app.send_task = original_send_task
+        routes.get_campaign_state = original_state
+        routes.initialize_campaign_progress = original_progress
+
+    assert missing.status_code == 404
+    assert response.status_code == 202
+    assert response.json()["total_emails"] == 2
+    assert enqueued == ["a@example.com", "c@example.com"]
+    # O progresso é reiniciado para acompanhar apenas os envios reenfileirados
+    assert progress == [("c1", 2)]
@@ -0,0 +1,191 @@
+"""Testes do acompanhamento de progresso de campanhas."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.infrastructure.progress import progress_publisher
+from app.infrastructure.progress.progress_stream import ProgressAggregator, stream_progress
+from app.main import app
+
+client = TestClient(app)
+
+
+class _FakePipeline:
+    """Pipeline Redis que apenas registra os comandos."""
+
+    def __init__(self, commands):
+        self.commands = commands
+
+    def execute(self):
+        self.commands.append(("execute",))
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.commands)
+
+    def register_script(self, script):
+        """Registra as chamadas do script de publicação no pipeline."""
+
+        def _call(keys, args, client):
+            ttl, channel, events, *counts = args
+            client.commands.append(("script", keys[0], channel, json.loads(events)))
+            for status, count in zip(counts[::2], counts[1::2]):
+                client.commands.append(("hincrby", keys[0], status, count))
+
+        return _call
+
+
+def test_publisher_batches_events_into_one_pipeline():
+    """Eventos são publicados em lote, com contadores agregados por status."""
+    fake = _FakeRedis()
+    original = progress_publisher.get_redis_client
+    progress_publisher.get_redis_client = lambda: fake
+    publisher = progress_publisher.ProgressPublisher(batch_size=3, flush_interval=3600)
+    try:
+        publisher.publish("c1", "t1", "a@example.com", "sent")
+        publisher.publish("c1", "t2", "b@example.com", "sent")
+        assert fake.commands == []
+
+        publisher.publish("c1", "t3", "c@example.com", "failed", "boom")
+    finally:
+        progress_publisher.get_redis_client = original
+
+    assert ("hincrby", "campaign:c1:progress", "sent", 2) in fake.commands
+    assert ("hincrby", "campaign:c1:progress", "failed", 1) in fake.commands
+    published = [cmd for cmd in fake.commands if cmd[0] == "script"]
+    assert len(published) == 1
+    assert published[0][2] == "campaign:c1:progress:events"
+    assert len(published[0][3]) == 3
+    assert fake.commands.count(("execute",)) == 1
+
+
+def test_aggregator_coalesces_events():
+    """O agregador resume contadores e falhas recentes."""
+    aggregator = ProgressAggregator(campaign_id="c1")
+    aggregator.load_counts({"total": "3", "sent": "1"})
+    aggregator.apply(
+        [
+            {"task_id": "t2", "to": "b@example.com", "status": "sent"},
+            {"task_id": "t3", "to": "c@example.com", "status": "failed", "error": "boom"},
+        ]
+    )
+
+    snapshot = aggregator.snapshot()
+    assert snapshot["counts"]["sent"] == 2
+    assert snapshot["done"] == 3
+    assert snapshot["finished"] is True
+    assert snapshot["recent_failures"][0]["error"] == "boom"
+    assert aggregator.dirty is False
+
+
+def test_aggregator_filters_task_ids():
+    """Com um conjunto de tarefas, eventos de outras tarefas são ignorados."""
+    aggregator = ProgressAggregator(campaign_id="c1", task_ids=["t1", "t2"])
+    aggregator.seed_task_status("t1", "sent")
+    aggregator.apply(
+        [
+            {"task_id": "t1", "status": "sent"},
+            {"task_id": "t9", "status": "sent"},
+            {"task_id": "t2", "status": "retrying", "error": "451"},
+        ]
+    )
+    assert aggregator.counts["sent"] == 1
+    assert aggregator.counts["retrying"] == 1
+    assert aggregator.finished is False
+
+
+def test_aggregator_skips_batches_already_in_snapshot():
+    """Lotes com sequência já incluída no snapshot não são contados de novo."""
+    aggregator = ProgressAggregator(campaign_id="c1")
+    aggregator.load_counts({"total": "3", "sent": "2", "seq": "2"})
+    aggregator.apply_batch({"seq": 2, "events": [{"task_id": "t2", "status": "sent"}]})
+    assert aggregator.done == 2
+
+    aggregator.apply_batch({"seq": 3, "events": [{"task_id": "t3", "status": "sent"}]})
+    assert aggregator.done == 3
+    assert aggregator.finished is True
+
+
+class _FakePubSub:
+    def __init__(self, batches):
+        self.messages = [{"type": "message", "data": json.dumps(batch)} for batch in batches]
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channel = channel
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        return self.messages.pop(0) if self.messages else None
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeAsyncRedis:
+    def __init__(self, counts, batches=()):
+        self.counts = counts
+        self._pubsub = _FakePubSub(batches)
+
+    def pubsub(self):
+        return self._pubsub
+
+    async def hgetall(self, key):
+        return self.counts
+
+    async def close(self):
+        pass
+
+
+async def test_stream_progress_emits_coalesced_updates():
+    """O stream envia um resumo por intervalo e encerra ao concluir."""
+    redis_client = _FakeAsyncRedis(
+        {"total": "2"},
+        [
+            {"seq": 1, "events": [{"task_id": "t1", "status": "sent"}]},
+            {"seq": 2, "events": [{"task_id": "t2", "status": "sent"}]},
+        ],
+    )
+    aggregator = ProgressAggregator(campaign_id="c1")
+    events = [event async for event in stream_progress(redis_client, aggregator, interval=0.01)]
+
+    assert redis_client._pubsub.channel == "campaign:c1:progress:events"
+    assert redis_client._pubsub.closed is True
+    assert events[-1].startswith("event: finished")
+    final = json.loads(events[-1].split("data: ", 1)[1])
+    assert final["counts"]["sent"] == 2
+
+
+async def test_stream_progress_ends_after_max_duration():
+    """Streams de campanhas que não terminam são encerrados após a duração máxima."""
+    redis_client = _FakeAsyncRedis({"total": "5"})
+    aggregator = ProgressAggregator(campaign_id="c1")
+    events = [
+        event
+        async for event in stream_progress(
+            redis_client, aggregator, interval=0.01, max_duration=0.05
+        )
+    ]
+
+    assert events[-1].startswith("event: timeout")
+    assert redis_client._pubsub.closed is True
+
+
+def test_stream_unknown_campaign_returns_404(monkeypatch):
+    """Campanhas sem progresso registrado não abrem um stream infinito."""
+
+    class _FakeAsyncRedis:
+        async def hexists(self, key, field):
+            return False
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(routes, "create_async_redis_client", _FakeAsyncRedis)
+    response = client.get("/api/v1/campaigns/unknown/progress/stream")
+    assert response.status_code == 404
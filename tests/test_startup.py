@@ -0,0 +1,15 @@
+"""Testes do custo de inicialização dos processos."""
+
+from benchmarks.startup import TARGETS, measure
+
+
+def test_api_does_not_import_worker_modules():
+    """A API publica tarefas pelo nome, sem carregar o worker nem o SMTP."""
+    result = measure(TARGETS["api"])
+    assert result["loaded"] == []
+
+
+def test_worker_loads_smtp_lazily():
+    """O worker só carrega o FastAPI-Mail no primeiro envio SMTP."""
+    result = measure(TARGETS["worker"])
+    assert "fastapi_mail" not in result["loaded"]
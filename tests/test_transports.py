@@ -0,0 +1,217 @@
+"""Testes dos transportes de e-mail."""
+
+import mailbox
+
+import pytest
+
+from app.domain.entities import EmailMessage
+from app.infrastructure.email import mail_client, transports
+
+
+def _message(to: str = "test@example.com") -> EmailMessage:
+    return EmailMessage(to=to, subject="Test", body="Test body")
+
+
+def test_build_transport_by_name():
+    """Testa a seleção do transporte pelo nome."""
+    assert isinstance(transports.build_transport("null"), transports.NullTransport)
+    assert isinstance(transports.build_transport("memory"), transports.InMemoryTransport)
+    with pytest.raises(ValueError):
+        transports.build_transport("carrier-pigeon")
+
+
+def test_send_email_uses_configured_transport():
+    """Testa que o cliente delega o envio ao transporte configurado."""
+    transport = transports.InMemoryTransport()
+    original = mail_client.get_transport
+    mail_client.get_transport = lambda: transport
+    try:
+        assert mail_client.send_email(_message()) is True
+    finally:
+        mail_client.get_transport = original
+
+    assert [message.to for message in transport.messages] == ["test@example.com"]
+
+
+def test_send_email_returns_false_on_transport_error():
+    """Testa que falhas do transporte resultam em False."""
+
+    class _FailingTransport(transports.EmailTransport):
+        def send(self, message):
+            raise transports.TransportError("boom")
+
+    original = mail_client.get_transport
+    mail_client.get_transport = lambda: _FailingTransport()
+    try:
+        assert mail_client.send_email(_message()) is False
+    finally:
+        mail_client.get_transport = original
+
+
+def test_send_email_returns_false_and_records_unexpected_errors(tmp_path):
+    """Erros fora de TransportError também viram falha registrada no controle."""
+    recorded = []
+
+    class _RecordingLimiter:
+        def record(self, success, latency, transient=False):
+            recorded.append((success, transient))
+
+    spool = transports.SpoolTransport(str(tmp_path / "outbox.mbox"), batch_size=1)
+
+    class _BrokenTransport(transports.EmailTransport):
+        def send(self, message):
+            raise ValueError("unexpected")
+
+    original_transport = mail_client.get_transport
+    original_limiter = mail_client.get_delivery_limiter
+    mail_client.get_delivery_limiter = lambda: _RecordingLimiter()
+    try:
+        mail_client.get_transport = lambda: spool
+        injected = EmailMessage(to="a@example.com", subject="Hi\nBcc: x@evil.com", body="b")
+        assert mail_client.send_email(injected) is False
+
+        mail_client.get_transport = lambda: _BrokenTransport()
+        assert mail_client.send_email(_message()) is False
+    finally:
+        mail_client.get_transport = original_transport
+        mail_client.get_delivery_limiter = original_limiter
+
+    assert recorded == [(False, False), (False, False)]
+    assert len(mailbox.mbox(str(tmp_path / "outbox.mbox"))) == 0
+
+
+def test_spool_transport_writes_in_batches(tmp_path):
+    """Testa que o spool só grava em disco ao completar um lote."""
+    path = str(tmp_path / "outbox.mbox")
+    transport = transports.SpoolTransport(path, batch_size=2, flush_interval=3600)
+
+    transport.send(_message("a@example.com"))
+    assert len(mailbox.mbox(path)) == 0
+
+    transport.send(_message("b@example.com"))
+    transport.send(_message("c@example.com"))
+    assert len(mailbox.mbox(path)) == 2
+
+    transport.close()
+    assert [msg["To"] for msg in mailbox.mbox(path)] == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+
+
+def test_spool_transport_maildir(tmp_path):
+    """Testa gravação no formato maildir."""
+    path = str(tmp_path / "outbox")
+    transport = transports.SpoolTransport(path, spool_format="maildir", batch_size=1)
+    transport.send(_message())
+    assert len(mailbox.Maildir(path)) == 1
+
+
+def test_transient_errors_are_detected_in_exception_chain():
+    """Testa a classificação de deferrals 4xx e timeouts como temporários."""
+
+    class _SMTPResponse(Exception):
+        def __init__(self, code):
+            super().__init__(f"SMTP {code}")
+            self.code = code
+
+    try:
+        try:
+            raise _SMTPResponse(451)
+        except _SMTPResponse as exc:
+            raise RuntimeError("wrapped") from exc
+    except RuntimeError as wrapped:
+        assert transports._is_transient(wrapped) is True
+
+    assert transports._is_transient(TimeoutError()) is True
+    assert transports._is_transient(_SMTPResponse(550)) is False
+
+
+def test_spool_transport_creates_directory_and_keeps_batch_on_error(tmp_path):
+    """Um lote que falha volta ao buffer e o diretório do spool é criado."""
+    path = str(tmp_path / "spool" / "outbox.mbox")
+    transport = transports.SpoolTransport(path, batch_size=10, flush_interval=3600)
+    transport.send(_message("a@example.com"))
+
+    def _failing_write(batch):
+        raise OSError("disk full")
+
+    original_write = transport._write
+    transport._write = _failing_write
+    transport.flush()
+    transport._write = original_write
+
+    transport.flush()
+    assert [msg["To"] for msg in mailbox.mbox(path)] == ["a@example.com"]
+
+
+def test_invalid_email_transport_is_rejected_by_settings():
+    """Valores inválidos de EMAIL_TRANSPORT são rejeitados na inicialização."""
+    from pydantic import ValidationError
+
+    from app.core.config import Settings
+
+    with pytest.raises(ValidationError):
+        Settings(EMAIL_TRANSPORT="carrier-pigeon")
+
+
+def test_spool_mbox_batches_only_append(tmp_path, monkeypatch):
+    """Lotes mbox são anexados sem reler o spool: o custo não cresce com o arquivo."""
+    path = tmp_path / "outbox.mbox"
+    transport = transports.SpoolTransport(str(path), batch_size=50, flush_interval=3600)
+    for index in range(200):
+        transport.send(_message(f"u{index}@example.com"))
+
+    modes = []
+    real_open = open
+
+    def _spy_open(file, mode="r", *args, **kwargs):
+        if str(file) == str(path):
+            modes.append(mode)
+        return real_open(file, mode, *args, **kwargs)
+
+    def _no_mailbox(*args, **kwargs):
+        raise AssertionError("o spool mbox não deve ser reindexado")
+
+    monkeypatch.setattr("builtins.open", _spy_open)
+    monkeypatch.setattr(transports.mailbox, "mbox", _no_mailbox)
+    size_before = path.stat().st_size
+    for index in range(50):
+        transport.send(_message(f"late{index}@example.com"))
+    monkeypatch.undo()
+
+    assert modes == ["ab"]
+    assert path.stat().st_size > size_before
+    assert len(mailbox.mbox(str(path))) == 250
+
+
+def test_spool_mbox_escapes_from_lines(tmp_path):
+    """Linhas do corpo iniciadas por "From " são escapadas (mboxrd)."""
+    path = str(tmp_path / "outbox.mbox")
+    transport = transports.SpoolTransport(path, batch_size=1, flush_interval=3600)
+    transport.send(EmailMessage(to="a@example.com", subject="Test", body="Oi\nFrom here\n"))
+    transport.send(_message("b@example.com"))
+
+    messages = list(mailbox.mbox(path))
+    assert [msg["To"] for msg in messages] == ["a@example.com", "b@example.com"]
+    assert ">From here" in messages[0].get_payload()
+
+
+def test_spool_transport_bounds_retained_batches(tmp_path):
+    """Com o destino falhando, o buffer retido não cresce indefinidamente."""
+    transport = transports.SpoolTransport(
+        str(tmp_path / "outbox.mbox"), batch_size=2, flush_interval=3600
+    )
+
+    def _failing_write(batch):
+        raise OSError("disk full")
+
+    transport._write = _failing_write
+    for index in range(100):
+        transport.send(_message(f"u{index}@example.com"))
+
+    limit = transport.batch_size * transport.max_retained_batches
+    assert len(transport._buffer) <= limit
+    # Os itens mais recentes são mantidos
+    assert transport._buffer[-1]["To"] == "u99@example.com"